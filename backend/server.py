@@ -1,28 +1,308 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response
 from dotenv import load_dotenv
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, TEXT, DeleteOne, IndexModel, InsertOne, ReplaceOne, ReturnDocument, UpdateOne, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 import os
 import logging
+import base64
+import cProfile
+import contextvars
+import functools
+import hashlib
+import hmac
+import html
+import csv
+import io
+import itertools
+import json
+import orjson
+import re
+import zlib
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, ValidationError, field_validator
 from typing import List, Optional
 import uuid
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from enum import Enum
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import asyncio
+import bisect
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import aiosmtplib
+except ImportError:  # only the executor email transport is available
+    aiosmtplib = None
+
+try:
+    import pyinstrument
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # route profiles fall back to cProfile
+    pyinstrument = None
+
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Metrics - minimal Prometheus-format counters, gauges and histograms kept in process memory
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def format_labels(label_names: tuple, label_values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_values, value in list(self._values.items()):
+            lines.append(f"{self.name}{format_labels(self.label_names, label_values)} {value}")
+        return lines
+
+class Gauge:
+    """Gauge (or counter kept elsewhere) whose samples are read from a callback at scrape time"""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple, collect, kind: str = "gauge"):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.collect = collect  # returns {label_values: value}
+        self.kind = kind
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for label_values, value in self.collect().items():
+            lines.append(f"{self.name}{format_labels(self.label_names, label_values)} {value}")
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, series in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                labels = format_labels(self.label_names, label_values, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.label_names, label_values)} {series[-1]}")
+            lines.append(f"{self.name}_count{format_labels(self.label_names, label_values)} {cumulative}")
+        return lines
+
+metrics = []
+
+def register_metric(metric):
+    metrics.append(metric)
+    return metric
+
+http_request_duration = register_metric(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status")
+))
+mongo_operation_duration = register_metric(Histogram(
+    "mongo_operation_duration_seconds", "MongoDB command latency",
+    ("collection", "command", "result")
+))
+smtp_send_duration = register_metric(Histogram(
+    "smtp_send_duration_seconds", "Time spent sending one email", ("result",)
+))
+smtp_sends = register_metric(Counter(
+    "smtp_sends_total", "Emails sent, by result", ("result",)
+))
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Records the duration of every MongoDB command"""
+
+    def __init__(self):
+        self._collections = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        self._collections[(event.connection_id, event.request_id)] = collection if isinstance(collection, str) else ""
+
+    def succeeded(self, event):
+        self._record(event, "success")
+
+    def failed(self, event):
+        self._record(event, "failure")
+
+    def _record(self, event, result: str):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        mongo_operation_duration.observe(event.duration_micros / 1e6, collection, event.command_name, result)
+        # Motor runs commands on its executor with a copy of the caller's context
+        timing = request_timing.get()
+        if timing is not None and current_phase.get() is None:
+            timing.add("mongo", event.duration_micros / 1e6)
+
+# Request timing - per-request phase durations reported in the Server-Timing header
+SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+SERVER_TIMING_PHASES = {
+    "validation": "Body parsing and validation",
+    "mongo": "MongoDB commands",
+    "render": "Email template rendering",
+    "email": "Email queueing",
+}
+
+class RequestTiming:
+    """Accumulates phase durations for one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.handler_started = None
+        self.phases = {}
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, seconds: float):
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def header(self) -> str:
+        entries = [
+            f'{phase};dur={self.phases[phase] * 1000:.1f};desc="{description}"'
+            for phase, description in SERVER_TIMING_PHASES.items() if phase in self.phases
+        ]
+        entries.append(f'total;dur={(time.perf_counter() - self.started) * 1000:.1f}')
+        return ", ".join(entries)
+
+request_timing = contextvars.ContextVar("request_timing", default=None)
+current_phase = contextvars.ContextVar("current_phase", default=None)
+
+@contextmanager
+def timed_phase(phase: str):
+    """Attribute the wall time of a block to a phase; Mongo commands inside it are not counted separately"""
+    timing = request_timing.get()
+    if timing is None:
+        yield
+        return
+    token = current_phase.set(phase)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        current_phase.reset(token)
+        timing.add(phase, time.perf_counter() - started)
+
+# Route profiling - an admin arms a route to be profiled for its next N requests
+PROFILE_DIR = Path(os.environ.get('PROFILE_DIR', str(ROOT_DIR / 'profiles')))
+profile_targets = {}
+profile_active = False
+
+def start_route_profile(method: str, path: str):
+    """Start a profiler if this route is armed and no other request is being profiled"""
+    global profile_active
+    key = f"{method} {path}"
+    if profile_active or not profile_targets.get(key):
+        return None
+    profile_targets[key] -= 1
+    if not profile_targets[key]:
+        del profile_targets[key]
+    profile_active = True
+    if pyinstrument is not None:
+        profiler = pyinstrument.Profiler(async_mode="enabled")
+        profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    return profiler
+
+def finish_route_profile(profiler, method: str, path: str):
+    """Stop the profiler and write speedscope JSON (pyinstrument) or pstats (cProfile) output"""
+    global profile_active
+    try:
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", path).strip("-") or "root"
+        name = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{method.lower()}-{slug}-{uuid.uuid4().hex[:8]}"
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        if pyinstrument is not None:
+            profiler.stop()
+            output = PROFILE_DIR / f"{name}.speedscope.json"
+            output.write_text(profiler.output(SpeedscopeRenderer()))
+        else:
+            profiler.disable()
+            output = PROFILE_DIR / f"{name}.prof"
+            profiler.dump_stats(str(output))
+        logger.info(f"Wrote profile for {method} {path} to {output}")
+    except Exception as e:
+        logger.error(f"Failed to write profile for {method} {path}: {str(e)}")
+    finally:
+        profile_active = False
+
+class TimedRoute(APIRoute):
+    """Route that marks where validation ends and profiles the request when armed"""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        # include_router rebuilds routes from the already-wrapped endpoint
+        if asyncio.iscoroutinefunction(endpoint) and not getattr(endpoint, "_timed", False):
+            original_endpoint = endpoint
+
+            @functools.wraps(original_endpoint)
+            async def endpoint(*args, **kwargs):
+                timing = request_timing.get()
+                if timing is not None and timing.handler_started is not None:
+                    timing.add("validation", time.perf_counter() - timing.handler_started)
+                return await original_endpoint(*args, **kwargs)
+
+            endpoint._timed = True
+
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timing = request_timing.get()
+            if timing is not None:
+                timing.handler_started = time.perf_counter()
+            profiler = start_route_profile(request.method, self.path)
+            if profiler is None:
+                return await handler(request)
+            try:
+                return await handler(request)
+            finally:
+                finish_route_profile(profiler, request.method, self.path)
+
+        return timed_handler
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandMetrics()])
 # Use DB_NAME from env if provided, otherwise use 'production' as fallback
 db_name = os.environ.get('DB_NAME', 'production')
 db = client[db_name]
@@ -31,7 +311,7 @@ db = client[db_name]
 app = FastAPI(title="Safe Building Inspections API", version="1.0.0")
 
 # Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", route_class=TimedRoute)
 
 
 # Define Enums
@@ -69,73 +349,405 @@ class ContactInquiry(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+# Projections returning exactly the model fields, so trusted documents can be serialized as-is
+STATUS_CHECK_PROJECTION = {"_id": 0, "id": 1, "client_name": 1, "timestamp": 1}
+INQUIRY_FIELDS = [
+    "id", "name", "email", "phone", "property_address", "inspection_type",
+    "preferred_date", "message", "status", "created_at", "updated_at"
+]
+INQUIRY_PROJECTION = {"_id": 0, **{field: 1 for field in INQUIRY_FIELDS}}
+
+def normalize_phone(phone: str) -> str:
+    """Digits only, with a +61 country code rewritten to the local 0 prefix"""
+    digits = re.sub(r"\D", "", phone)
+    if digits.startswith("61") and len(digits) == 11:
+        digits = "0" + digits[2:]
+    return digits
+
+def inquiry_document(inquiry: "ContactInquiry") -> dict:
+    """Stored form of an inquiry, with the derived fields search relies on"""
+    document = inquiry.dict()
+    document["phone_digits"] = normalize_phone(inquiry.phone)
+    # Cleared once the emails are in the outbox; see recover_pending_emails
+    document["emails_pending_since"] = inquiry.created_at
+    return document
+
 class ContactInquiryCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     email: EmailStr
     phone: str = Field(..., min_length=8, max_length=20)
     property_address: str = Field(..., min_length=5, max_length=200)
     inspection_type: InspectionType
-    preferred_date: Optional[str] = None
+    # Kept as YYYY-MM-DD text, which the preferred date filters compare as strings
+    preferred_date: Optional[str] = Field(None, pattern=r"^\d{4}-\d{2}-\d{2}$")
     message: Optional[str] = Field(None, max_length=1000)
 
+    @field_validator("preferred_date")
+    @classmethod
+    def preferred_date_is_a_date(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            date.fromisoformat(value)
+        return value
+
 class ContactInquiryResponse(BaseModel):
     id: str
     message: str
     status: str
 
+class BulkInquiryResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: str
+    error: Optional[str] = None
+
+class BulkInquiryResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkInquiryResult]
+
+class InquiryStatusUpdate(BaseModel):
+    id: str
+    status: InquiryStatus
+
+class BulkStatusResult(BaseModel):
+    id: str
+    status: str
+    previous_status: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkStatusResponse(BaseModel):
+    updated: int
+    failed: int
+    results: List[BulkStatusResult]
+
 # Email configuration - Read from environment variables
 GMAIL_EMAIL = os.environ.get('GMAIL_EMAIL', 'info@safebuildinginspections.com.au')
 GMAIL_PASSWORD = os.environ.get('GMAIL_PASSWORD', 'pgxa foxu hohn nmzp')
 GMAIL_SMTP_SERVER = os.environ.get('GMAIL_SMTP_SERVER', 'smtp.gmail.com')
 GMAIL_SMTP_PORT = int(os.environ.get('GMAIL_SMTP_PORT', '587'))
 
+GMAIL_SMTP_USE_TLS = os.environ.get('GMAIL_SMTP_USE_TLS', 'true').lower() == 'true'
+SMTP_POOL_SIZE = int(os.environ.get('SMTP_POOL_SIZE', '3'))
+SMTP_POOL_IDLE_TIMEOUT = float(os.environ.get('SMTP_POOL_IDLE_TIMEOUT', '60'))
+SMTP_TIMEOUT = float(os.environ.get('SMTP_TIMEOUT', '30'))
+# "asyncio" sends on the event loop via aiosmtplib, "executor" through the blocking smtplib thread pool
+EMAIL_TRANSPORT = os.environ.get('EMAIL_TRANSPORT', 'asyncio').lower()
+SMTP_ASYNC_CONCURRENCY = int(os.environ.get('SMTP_ASYNC_CONCURRENCY', '10'))
+
+# Outbox dispatcher configuration
+# Default to as many sends in flight as the email transport can carry
+OUTBOX_CONCURRENCY = int(os.environ.get(
+    'OUTBOX_CONCURRENCY',
+    str(SMTP_ASYNC_CONCURRENCY if EMAIL_TRANSPORT == 'asyncio' and aiosmtplib is not None else SMTP_POOL_SIZE)
+))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', '5'))
+OUTBOX_BACKOFF_SECONDS = float(os.environ.get('OUTBOX_BACKOFF_SECONDS', '30'))
+OUTBOX_LOCK_SECONDS = float(os.environ.get('OUTBOX_LOCK_SECONDS', '300'))
+OUTBOX_POLL_INTERVAL = float(os.environ.get('OUTBOX_POLL_INTERVAL', '5'))
+OUTBOX_SEND_TIMEOUT = float(os.environ.get('OUTBOX_SEND_TIMEOUT', '60'))
+OUTBOX_RECOVERY_AGE = float(os.environ.get('OUTBOX_RECOVERY_AGE', '120'))
+OUTBOX_RECOVERY_INTERVAL = float(os.environ.get('OUTBOX_RECOVERY_INTERVAL', '300'))
+OUTBOX_RECOVERY_BATCH_SIZE = 100
+# Sent and dead messages carry full rendered bodies, so they are expired after this long
+OUTBOX_RETENTION_SECONDS = int(os.environ.get('OUTBOX_RETENTION_SECONDS', str(14 * 24 * 60 * 60)))
+
 # Thread pool for email sending
 email_executor = ThreadPoolExecutor(max_workers=3)
 
+class SMTPConnectionPool:
+    """Thread-safe pool of long-lived, authenticated SMTP sessions"""
+
+    def __init__(self, host: str, port: int, username: str = "", password: str = "",
+                 use_tls: bool = True, max_size: int = 3, idle_timeout: float = 60.0,
+                 timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = deque()  # (server, last_used) pairs, most recently used on the right
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def acquire(self) -> smtplib.SMTP:
+        """Check out a healthy session, reconnecting if the server dropped it"""
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        break
+                    server, last_used = self._idle.pop()
+                if time.monotonic() - last_used <= self.idle_timeout and self._is_alive(server):
+                    return server
+                self._close(server)
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, server: smtplib.SMTP, discard: bool = False):
+        """Return a session to the pool, or close it if it is no longer usable"""
+        try:
+            if discard:
+                self._close(server)
+            else:
+                with self._lock:
+                    self._idle.append((server, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        server = self.acquire()
+        try:
+            yield server
+        except Exception:
+            self.release(server, discard=True)
+            raise
+        else:
+            self.release(server)
+
+    def prune_idle(self) -> int:
+        """Close sessions that have been idle longer than idle_timeout"""
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            stale = [entry for entry in self._idle if entry[1] < cutoff]
+            self._idle = deque(entry for entry in self._idle if entry[1] >= cutoff)
+        for server, _ in stale:
+            self._close(server)
+        return len(stale)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for server, _ in idle:
+            self._close(server)
+
+smtp_pool = SMTPConnectionPool(
+    GMAIL_SMTP_SERVER,
+    GMAIL_SMTP_PORT,
+    username=GMAIL_EMAIL,
+    password=GMAIL_PASSWORD,
+    use_tls=GMAIL_SMTP_USE_TLS,
+    max_size=SMTP_POOL_SIZE,
+    idle_timeout=SMTP_POOL_IDLE_TIMEOUT,
+    timeout=SMTP_TIMEOUT,
+)
+
+class AsyncSMTPConnectionPool:
+    """Event-loop counterpart of SMTPConnectionPool built on aiosmtplib"""
+
+    def __init__(self, host: str, port: int, username: str = "", password: str = "",
+                 use_tls: bool = True, max_size: int = 10, idle_timeout: float = 60.0,
+                 timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = deque()  # (server, last_used) pairs, most recently used on the right
+        self._slots = asyncio.Semaphore(max_size)
+
+    async def _connect(self):
+        server = aiosmtplib.SMTP(hostname=self.host, port=self.port, timeout=self.timeout, start_tls=self.use_tls)
+        # BaseException too: a cancelled connect or login must not leave the socket open
+        try:
+            await server.connect()
+            if self.username:
+                await server.login(self.username, self.password)
+        except BaseException:
+            server.close()
+            raise
+        return server
+
+    @staticmethod
+    async def _close(server):
+        try:
+            await server.quit()
+        except Exception:
+            server.close()
+
+    @staticmethod
+    async def _is_alive(server) -> bool:
+        if not server.is_connected:
+            return False
+        try:
+            return (await server.noop()).code == 250
+        except (aiosmtplib.SMTPException, OSError):
+            return False
+
+    async def _acquire(self):
+        while self._idle:
+            server, last_used = self._idle.pop()
+            try:
+                if time.monotonic() - last_used <= self.idle_timeout and await self._is_alive(server):
+                    return server
+            except BaseException:
+                server.close()
+                raise
+            await self._close(server)
+        return await self._connect()
+
+    async def send(self, message):
+        """Send over a pooled session, retrying once if the server dropped it"""
+        async with self._slots:
+            for attempt in range(2):
+                server = await self._acquire()
+                try:
+                    await server.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    server.close()
+                    if attempt:
+                        raise
+                    continue
+                except Exception:
+                    await self._close(server)
+                    raise
+                except BaseException:
+                    # Cancelled mid-conversation (e.g. the outbox send timeout): the session is in an unknown state
+                    server.close()
+                    raise
+                self._idle.append((server, time.monotonic()))
+                return
+
+    async def prune_idle(self) -> int:
+        cutoff = time.monotonic() - self.idle_timeout
+        stale = [entry for entry in self._idle if entry[1] < cutoff]
+        self._idle = deque(entry for entry in self._idle if entry[1] >= cutoff)
+        for server, _ in stale:
+            await self._close(server)
+        return len(stale)
+
+    async def close_all(self):
+        idle, self._idle = self._idle, deque()
+        for server, _ in idle:
+            await self._close(server)
+
+async_smtp_pool = None
+if EMAIL_TRANSPORT == "asyncio" and aiosmtplib is not None:
+    async_smtp_pool = AsyncSMTPConnectionPool(
+        GMAIL_SMTP_SERVER,
+        GMAIL_SMTP_PORT,
+        username=GMAIL_EMAIL,
+        password=GMAIL_PASSWORD,
+        use_tls=GMAIL_SMTP_USE_TLS,
+        max_size=SMTP_ASYNC_CONCURRENCY,
+        idle_timeout=SMTP_POOL_IDLE_TIMEOUT,
+        timeout=SMTP_TIMEOUT,
+    )
+
+def build_email_message(to_email: str, subject: str, html_content: str, text_content: str = "") -> MIMEMultipart:
+    msg = MIMEMultipart('alternative')
+    msg['From'] = GMAIL_EMAIL
+    msg['To'] = to_email
+    msg['Subject'] = subject
+    
+    # Add text and HTML parts
+    if text_content:
+        part1 = MIMEText(text_content, 'plain')
+        msg.attach(part1)
+    
+    part2 = MIMEText(html_content, 'html')
+    msg.attach(part2)
+    return msg
+
 def send_email_sync(to_email: str, subject: str, html_content: str, text_content: str = ""):
     """Send email using Gmail SMTP (synchronous)"""
+    started = time.perf_counter()
+    sent = send_email_message(to_email, subject, html_content, text_content)
+    result = "success" if sent else "failure"
+    smtp_send_duration.observe(time.perf_counter() - started, result)
+    smtp_sends.inc(result)
+    return sent
+
+def send_email_message(to_email: str, subject: str, html_content: str, text_content: str = ""):
     try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['From'] = GMAIL_EMAIL
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        
-        # Add text and HTML parts
-        if text_content:
-            part1 = MIMEText(text_content, 'plain')
-            msg.attach(part1)
-        
-        part2 = MIMEText(html_content, 'html')
-        msg.attach(part2)
-        
-        # Send email
-        server = smtplib.SMTP(GMAIL_SMTP_SERVER, GMAIL_SMTP_PORT)
-        server.starttls()
-        server.login(GMAIL_EMAIL, GMAIL_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-        
-        return True
+        msg = build_email_message(to_email, subject, html_content, text_content)
+        
+        # Send email over a pooled session, retrying once if the server dropped it
+        for attempt in range(2):
+            try:
+                with smtp_pool.connection() as server:
+                    server.send_message(msg)
+                return True
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                if attempt:
+                    raise
     except Exception as e:
         logger.error(f"Failed to send email to {to_email}: {str(e)}")
         return False
 
 async def send_email_async(to_email: str, subject: str, html_content: str, text_content: str = ""):
-    """Send email asynchronously"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        email_executor, 
-        send_email_sync, 
-        to_email, 
-        subject, 
-        html_content, 
-        text_content
-    )
+    """Send email on the event loop, or through the thread pool when EMAIL_TRANSPORT=executor"""
+    if async_smtp_pool is None:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            email_executor, 
+            send_email_sync, 
+            to_email, 
+            subject, 
+            html_content, 
+            text_content
+        )
+    
+    started = time.perf_counter()
+    try:
+        await async_smtp_pool.send(build_email_message(to_email, subject, html_content, text_content))
+        sent = True
+    except Exception as e:
+        logger.error(f"Failed to send email to {to_email}: {str(e)}")
+        sent = False
+    result = "success" if sent else "failure"
+    smtp_send_duration.observe(time.perf_counter() - started, result)
+    smtp_sends.inc(result)
+    return sent
+
+# Labels are fixed per enum value, so render them once
+INSPECTION_TYPE_LABELS = {t: t.value.replace('-', ' ').title() for t in InspectionType}
 
 def create_business_notification_email(inquiry: ContactInquiry) -> tuple:
     """Create email content for business notification"""
     subject = f"🏠 New Inspection Request - {inquiry.name}"
+    inspection_type = INSPECTION_TYPE_LABELS[inquiry.inspection_type]
+    submitted = inquiry.created_at.strftime('%B %d, %Y at %I:%M %p')
+    
+    # Form fields are escaped for the HTML part only
+    name, email, phone = html.escape(inquiry.name), html.escape(inquiry.email), html.escape(inquiry.phone)
+    property_address = html.escape(inquiry.property_address)
+    message_block = f'<h3>Customer Message:</h3><div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin: 10px 0;"><em>"{html.escape(inquiry.message)}"</em></div>' if inquiry.message else ''
     
     html_content = f"""
     <!DOCTYPE html>
@@ -165,20 +777,20 @@ def create_business_notification_email(inquiry: ContactInquiry) -> tuple:
             
             <h3>Customer Information:</h3>
             <table class="info-table">
-                <tr><th>Name</th><td>{inquiry.name}</td></tr>
-                <tr><th>Email</th><td><a href="mailto:{inquiry.email}">{inquiry.email}</a></td></tr>
-                <tr><th>Phone</th><td><a href="tel:{inquiry.phone}">{inquiry.phone}</a></td></tr>
-                <tr><th>Property Address</th><td>{inquiry.property_address}</td></tr>
-                <tr><th>Inspection Type</th><td>{inquiry.inspection_type.replace('-', ' ').title()}</td></tr>
-                <tr><th>Preferred Date</th><td>{inquiry.preferred_date or 'Not specified'}</td></tr>
-                <tr><th>Submitted</th><td>{inquiry.created_at.strftime('%B %d, %Y at %I:%M %p')}</td></tr>
+                <tr><th>Name</th><td>{name}</td></tr>
+                <tr><th>Email</th><td><a href="mailto:{email}">{email}</a></td></tr>
+                <tr><th>Phone</th><td><a href="tel:{phone}">{phone}</a></td></tr>
+                <tr><th>Property Address</th><td>{property_address}</td></tr>
+                <tr><th>Inspection Type</th><td>{inspection_type}</td></tr>
+                <tr><th>Preferred Date</th><td>{html.escape(inquiry.preferred_date or 'Not specified')}</td></tr>
+                <tr><th>Submitted</th><td>{submitted}</td></tr>
             </table>
             
-            {f'<h3>Customer Message:</h3><div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin: 10px 0;"><em>"{inquiry.message}"</em></div>' if inquiry.message else ''}
+            {message_block}
             
             <h3>📋 Next Steps:</h3>
             <ol>
-                <li><strong>Call customer within 2 hours:</strong> <a href="tel:{inquiry.phone}">{inquiry.phone}</a></li>
+                <li><strong>Call customer within 2 hours:</strong> <a href="tel:{phone}">{phone}</a></li>
                 <li><strong>Confirm inspection details and scheduling</strong></li>
                 <li><strong>Send quote if needed</strong></li>
                 <li><strong>Update inquiry status in system</strong></li>
@@ -193,6 +805,8 @@ def create_business_notification_email(inquiry: ContactInquiry) -> tuple:
     </html>
     """
     
+    message_block = f'Customer Message: "{inquiry.message}"' if inquiry.message else ''
+    
     text_content = f"""
     NEW INSPECTION REQUEST - SAFE BUILDING INSPECTIONS
     
@@ -203,11 +817,11 @@ def create_business_notification_email(inquiry: ContactInquiry) -> tuple:
     - Email: {inquiry.email}
     - Phone: {inquiry.phone}
     - Property: {inquiry.property_address}
-    - Type: {inquiry.inspection_type.replace('-', ' ').title()}
+    - Type: {inspection_type}
     - Preferred Date: {inquiry.preferred_date or 'Not specified'}
-    - Submitted: {inquiry.created_at.strftime('%B %d, %Y at %I:%M %p')}
+    - Submitted: {submitted}
     
-    {f'Customer Message: "{inquiry.message}"' if inquiry.message else ''}
+    {message_block}
     
     Next Steps:
     1. Call customer: {inquiry.phone}
@@ -222,7 +836,11 @@ def create_business_notification_email(inquiry: ContactInquiry) -> tuple:
 
 def create_customer_confirmation_email(inquiry: ContactInquiry) -> tuple:
     """Create email content for customer confirmation"""
-    subject = f"✅ Inspection Request Received - Safe Building Inspections"
+    subject = "✅ Inspection Request Received - Safe Building Inspections"
+    inspection_type = INSPECTION_TYPE_LABELS[inquiry.inspection_type]
+    
+    # Form fields are escaped for the HTML part only
+    name, property_address = html.escape(inquiry.name), html.escape(inquiry.property_address)
     
     html_content = f"""
     <!DOCTYPE html>
@@ -244,15 +862,15 @@ def create_customer_confirmation_email(inquiry: ContactInquiry) -> tuple:
         </div>
         
         <div class="content">
-            <h2>Hello {inquiry.name},</h2>
+            <h2>Hello {name},</h2>
             
             <p>Thank you for choosing Safe Building Inspections! We've received your inspection request and will contact you within <strong>2 hours</strong> to confirm your appointment.</p>
             
             <div class="info-box">
                 <h3>📋 Your Request Details:</h3>
-                <p><strong>Property:</strong> {inquiry.property_address}</p>
-                <p><strong>Inspection Type:</strong> {inquiry.inspection_type.replace('-', ' ').title()}</p>
-                <p><strong>Preferred Date:</strong> {inquiry.preferred_date or 'To be discussed'}</p>
+                <p><strong>Property:</strong> {property_address}</p>
+                <p><strong>Inspection Type:</strong> {inspection_type}</p>
+                <p><strong>Preferred Date:</strong> {html.escape(inquiry.preferred_date or 'To be discussed')}</p>
                 <p><strong>Reference ID:</strong> {inquiry.id}</p>
             </div>
             
@@ -305,7 +923,7 @@ def create_customer_confirmation_email(inquiry: ContactInquiry) -> tuple:
     
     YOUR REQUEST DETAILS:
     - Property: {inquiry.property_address}
-    - Inspection Type: {inquiry.inspection_type.replace('-', ' ').title()}
+    - Inspection Type: {inspection_type}
     - Preferred Date: {inquiry.preferred_date or 'To be discussed'}
     - Reference ID: {inquiry.id}
     
@@ -339,114 +957,988 @@ def create_customer_confirmation_email(inquiry: ContactInquiry) -> tuple:
     
     return subject, html_content, text_content
 
+def create_business_digest_email(inquiries: List[ContactInquiry]) -> tuple:
+    """Create a single business notification covering a batch of inquiries"""
+    subject = f"🏠 {len(inquiries)} New Inspection Requests"
+    count = len(inquiries)
+    
+    html_rows, text_rows = [], []
+    for inquiry in inquiries:
+        inspection_type = INSPECTION_TYPE_LABELS[inquiry.inspection_type]
+        name, email, phone = html.escape(inquiry.name), html.escape(inquiry.email), html.escape(inquiry.phone)
+        property_address = html.escape(inquiry.property_address)
+        preferred_date = inquiry.preferred_date or 'Not specified'
+        html_rows.append(f'                <tr><td>{name}</td><td><a href="mailto:{email}">{email}</a></td><td><a href="tel:{phone}">{phone}</a></td><td>{property_address}</td><td>{inspection_type}</td><td>{html.escape(preferred_date)}</td><td>{inquiry.id}</td></tr>')
+        text_rows.append(f'    - {inquiry.name} | {inquiry.email} | {inquiry.phone} | {inquiry.property_address} | {inspection_type} | Preferred Date: {preferred_date} | Inquiry ID: {inquiry.id}')
+    html_rows, text_rows = "\n".join(html_rows), "\n".join(text_rows)
+    
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+            .header {{ background-color: #1e3a8a; color: white; padding: 20px; text-align: center; }}
+            .content {{ padding: 20px; }}
+            .info-table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
+            .info-table th, .info-table td {{ padding: 12px; text-align: left; border-bottom: 1px solid #ddd; }}
+            .info-table th {{ background-color: #f8f9fa; font-weight: bold; }}
+            .priority {{ background-color: #fff3cd; padding: 15px; border-left: 4px solid #ffc107; margin: 20px 0; }}
+            .footer {{ background-color: #f8f9fa; padding: 15px; text-align: center; font-size: 12px; color: #666; }}
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>🏠 SAFE BUILDING INSPECTIONS</h1>
+            <h2>{count} New Inspection Requests</h2>
+        </div>
+        
+        <div class="content">
+            <div class="priority">
+                <strong>⚡ Action Required:</strong> {count} new inspection requests received from partner referrals - respond within 2 hours as promised to customers.
+            </div>
+            
+            <table class="info-table">
+                <tr><th>Name</th><th>Email</th><th>Phone</th><th>Property Address</th><th>Inspection Type</th><th>Preferred Date</th><th>Inquiry ID</th></tr>
+{html_rows}
+            </table>
+        </div>
+        
+        <div class="footer">
+            <p>This notification was sent automatically from your Safe Building Inspections website.</p>
+        </div>
+    </body>
+    </html>
+    """
+    
+    text_content = f"""
+    {count} NEW INSPECTION REQUESTS - SAFE BUILDING INSPECTIONS
+    
+    ACTION REQUIRED: Respond within 2 hours as promised to customers.
+    
+{text_rows}
+    """
+    
+    return subject, html_content, text_content
+
+# Email outbox - emails are persisted with the inquiry and delivered by a background dispatcher
+class OutboxStatus(str, Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    DEAD = "dead"
+
+outbox_wakeup = asyncio.Event()
+outbox_inflight = set()
+
+def build_outbox_message(inquiry_ids: List[str], kind: str, to_email: str, email_content: tuple) -> dict:
+    subject, html_content, text_content = email_content
+    now = datetime.utcnow()
+    return {
+        "id": str(uuid.uuid4()),
+        "inquiry_ids": inquiry_ids,
+        "kind": kind,
+        "to_email": to_email,
+        "subject": subject,
+        "html_content": html_content,
+        "text_content": text_content,
+        "status": OutboxStatus.PENDING,
+        "attempts": 0,
+        "last_error": None,
+        "next_attempt_at": now,
+        "locked_until": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+async def enqueue_inquiry_emails(inquiry: ContactInquiry):
+    """Queue the business notification and customer confirmation for an inquiry"""
+    with timed_phase("render"):
+        messages = [
+            build_outbox_message([inquiry.id], "business", GMAIL_EMAIL, create_business_notification_email(inquiry)),
+            build_outbox_message([inquiry.id], "customer", inquiry.email, create_customer_confirmation_email(inquiry)),
+        ]
+    with timed_phase("email"):
+        await db.email_outbox.insert_many(messages)
+        await clear_emails_pending([inquiry.id])
+    outbox_wakeup.set()
+
+async def enqueue_batch_emails(inquiries: List[ContactInquiry]):
+    """Queue one digest business notification plus a customer confirmation per inquiry"""
+    inquiry_ids = [inquiry.id for inquiry in inquiries]
+    with timed_phase("render"):
+        messages = [build_outbox_message(inquiry_ids, "digest", GMAIL_EMAIL, create_business_digest_email(inquiries))]
+        messages.extend(
+            build_outbox_message([inquiry.id], "customer", inquiry.email, create_customer_confirmation_email(inquiry))
+            for inquiry in inquiries
+        )
+    with timed_phase("email"):
+        await db.email_outbox.insert_many(messages)
+        await clear_emails_pending(inquiry_ids)
+    outbox_wakeup.set()
+
+async def clear_emails_pending(inquiry_ids: List[str]):
+    await db.contact_inquiries.update_many(
+        {"id": {"$in": inquiry_ids}}, {"$unset": {"emails_pending_since": ""}}
+    )
+
+async def recover_pending_emails() -> int:
+    """
+    Queue emails for inquiries stored without their outbox messages.
+    The inquiry and outbox inserts are separate writes (transactions need a replica set), so a
+    failed or interrupted enqueue leaves emails_pending_since on the inquiry. Inquiries that
+    already have outbox messages only had the marker update lost and are just cleared. An
+    enqueue slower than OUTBOX_RECOVERY_AGE can still be queued twice.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=OUTBOX_RECOVERY_AGE)
+    documents = await db.contact_inquiries.find(
+        {"emails_pending_since": {"$lte": cutoff}}, INQUIRY_PROJECTION
+    ).sort("emails_pending_since", ASCENDING).limit(OUTBOX_RECOVERY_BATCH_SIZE).to_list(OUTBOX_RECOVERY_BATCH_SIZE)
+    recovered = 0
+    for document in documents:
+        inquiry = ContactInquiry(**document)
+        if await db.email_outbox.find_one({"inquiry_ids": inquiry.id}, {"_id": 1}):
+            await clear_emails_pending([inquiry.id])
+            continue
+        await enqueue_inquiry_emails(inquiry)
+        recovered += 1
+    if recovered:
+        logger.warning(f"Queued emails for {recovered} inquiries whose outbox write did not complete")
+    return recovered
+
+async def recover_pending_emails_periodically():
+    while True:
+        try:
+            await recover_pending_emails()
+        except Exception as e:
+            logger.error(f"Failed to recover pending emails: {str(e)}")
+        await asyncio.sleep(OUTBOX_RECOVERY_INTERVAL)
+
+def describe_outbox_message(message: dict) -> str:
+    inquiry_ids = message["inquiry_ids"]
+    if len(inquiry_ids) == 1:
+        return f"{message['kind']} email to {message['to_email']} for inquiry {inquiry_ids[0]}"
+    return f"{message['kind']} email to {message['to_email']} for {len(inquiry_ids)} inquiries"
+
+async def claim_outbox_message() -> Optional[dict]:
+    """Atomically lock the next due message, reclaiming ones whose lock has expired"""
+    now = datetime.utcnow()
+    return await db.email_outbox.find_one_and_update(
+        {"$or": [
+            {"status": OutboxStatus.PENDING, "next_attempt_at": {"$lte": now}},
+            {"status": OutboxStatus.SENDING, "locked_until": {"$lte": now}},
+        ]},
+        {"$set": {
+            "status": OutboxStatus.SENDING,
+            "locked_until": now + timedelta(seconds=OUTBOX_LOCK_SECONDS),
+            "updated_at": now,
+        }},
+        sort=[("next_attempt_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+async def release_outbox_message(message: dict):
+    """Hand a claimed message back so it is picked up again without waiting for its lock to expire"""
+    await db.email_outbox.update_one(
+        {"id": message["id"], "status": OutboxStatus.SENDING},
+        {"$set": {"status": OutboxStatus.PENDING, "locked_until": None, "updated_at": datetime.utcnow()}}
+    )
+
+async def deliver_outbox_message(message: dict):
+    """Send a claimed message and record success, retry with backoff, or dead-letter it"""
+    started = time.perf_counter()
+    try:
+        sent = await asyncio.wait_for(
+            send_email_async(
+                message["to_email"],
+                message["subject"],
+                message["html_content"],
+                message["text_content"]
+            ),
+            OUTBOX_SEND_TIMEOUT
+        )
+        error = None if sent else "SMTP send failed"
+    except asyncio.TimeoutError:
+        sent, error = False, f"Timed out after {OUTBOX_SEND_TIMEOUT:g}s"
+    except asyncio.CancelledError:
+        logger.warning(f"Cancelled {describe_outbox_message(message)}, returning it to the outbox")
+        await release_outbox_message(message)
+        raise
+    except Exception as e:
+        sent, error = False, str(e)
+    elapsed = time.perf_counter() - started
+
+    now = datetime.utcnow()
+    attempts = message["attempts"] + 1
+    if sent:
+        update = {"status": OutboxStatus.SENT, "attempts": attempts, "last_error": None, "finished_at": now}
+        logger.info(f"Sent {describe_outbox_message(message)} in {elapsed:.2f}s")
+    elif attempts >= OUTBOX_MAX_ATTEMPTS:
+        update = {"status": OutboxStatus.DEAD, "attempts": attempts, "last_error": error, "finished_at": now}
+        logger.error(f"Giving up on {describe_outbox_message(message)} after {attempts} attempts ({elapsed:.2f}s): {error}")
+    else:
+        update = {
+            "status": OutboxStatus.PENDING,
+            "attempts": attempts,
+            "last_error": error,
+            "next_attempt_at": now + timedelta(seconds=OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1)),
+        }
+        logger.warning(f"Retrying {describe_outbox_message(message)} (attempt {attempts}, {elapsed:.2f}s): {error}")
+    update.update({"locked_until": None, "updated_at": now})
+    await db.email_outbox.update_one({"id": message["id"]}, {"$set": update})
+
+async def dispatch_outbox():
+    """Drain the email outbox with at most OUTBOX_CONCURRENCY sends in flight"""
+    semaphore = asyncio.Semaphore(OUTBOX_CONCURRENCY)
+    while True:
+        await semaphore.acquire()
+        outbox_wakeup.clear()
+        try:
+            message = await claim_outbox_message()
+        except Exception as e:
+            semaphore.release()
+            logger.error(f"Failed to claim outbox message: {str(e)}")
+            await asyncio.sleep(OUTBOX_POLL_INTERVAL)
+            continue
+
+        if message is None:
+            semaphore.release()
+            try:
+                await asyncio.wait_for(outbox_wakeup.wait(), OUTBOX_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        task = asyncio.create_task(deliver_outbox_message(message))
+        outbox_inflight.add(task)
+        task.add_done_callback(outbox_inflight.discard)
+        task.add_done_callback(lambda _: semaphore.release())
+
+# Inquiry change events - fanned out to SSE clients by an in-process hub, fed either
+# by the write endpoints or, when MONGO_CHANGE_STREAMS is enabled, by a change stream
+MONGO_CHANGE_STREAMS = os.environ.get('MONGO_CHANGE_STREAMS', 'false').lower() == 'true'
+EVENT_QUEUE_SIZE = int(os.environ.get('EVENT_QUEUE_SIZE', '100'))
+EVENT_KEEPALIVE_SECONDS = 15
+
+class EventHub:
+    """In-process pub/sub that fans events out to one bounded queue per subscriber"""
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self.sequence = 0
+        self._subscribers = set()
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def publish(self, event_type: str, data: dict):
+        self.sequence += 1
+        event = (self.sequence, event_type, data)
+        for queue in self._subscribers:
+            # A slow client loses its oldest events rather than blocking publishers
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+inquiry_events = EventHub(queue_size=EVENT_QUEUE_SIZE)
+change_stream_active = False
+
+def publish_inquiry_created(inquiry: dict):
+    if not change_stream_active:
+        inquiry_events.publish("inquiry.created", inquiry)
+
+def publish_inquiry_status(inquiry_id: str, previous_status: str, status: str, updated_at: datetime):
+    if not change_stream_active:
+        inquiry_events.publish("inquiry.status", {
+            "id": inquiry_id,
+            "previous_status": previous_status,
+            "status": status,
+            "updated_at": updated_at,
+        })
+
+async def watch_inquiry_changes():
+    """Publish inquiry changes from a Mongo change stream so every worker sees every write"""
+    global change_stream_active
+    pipeline = [{"$match": {"operationType": {"$in": ["insert", "update"]}}}]
+    try:
+        async with db.contact_inquiries.watch(pipeline, full_document="updateLookup") as stream:
+            change_stream_active = True
+            logger.info("Publishing inquiry events from MongoDB change stream")
+            async for change in stream:
+                document = change.get("fullDocument")
+                if not document:
+                    continue
+                document = {field: document.get(field) for field in INQUIRY_FIELDS}
+                if change["operationType"] == "insert":
+                    inquiry_events.publish("inquiry.created", document)
+                    continue
+                inquiry_cache.invalidate(document["id"])
+                if "status" in change["updateDescription"]["updatedFields"]:
+                    # Change streams don't carry the previous value without pre-images
+                    inquiry_events.publish("inquiry.status", {
+                        "id": document["id"],
+                        "previous_status": None,
+                        "status": document["status"],
+                        "updated_at": document["updated_at"],
+                    })
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning(f"Change stream unavailable, publishing inquiry events in-process: {str(e)}")
+    finally:
+        change_stream_active = False
+
 # Add your routes to the router instead of directly to app
 @api_router.get("/")
 async def root():
     return {"message": "Safe Building Inspections API is running"}
 
+# Keyset pagination - cursors encode the (sort value, id) of the last item on a page
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', '200'))
+
+def encode_token(payload: dict) -> str:
+    data = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+def decode_token(token: str) -> dict:
+    payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    if not isinstance(payload, dict):
+        raise ValueError("cursor payload is not an object")
+    return payload
+
+def encode_cursor(sort_value: datetime, item_id: str) -> str:
+    return encode_token({"c": sort_value.isoformat(), "i": item_id})
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        payload = decode_token(cursor)
+        return datetime.fromisoformat(payload["c"]), str(payload["i"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def after_cursor(cursor: str, field: str = "created_at") -> dict:
+    """Filter matching items that sort after the cursor in (field desc, id desc) order"""
+    sort_value, item_id = decode_cursor(cursor)
+    return {"$or": [
+        {field: {"$lt": sort_value}},
+        {field: sort_value, "id": {"$lt": item_id}},
+    ]}
+
+def time_range(since: Optional[datetime], until: Optional[datetime]) -> dict:
+    bounds = {}
+    if since:
+        bounds["$gte"] = since
+    if until:
+        bounds["$lt"] = until
+    return bounds
+
+# In-process caching
+class TTLCache:
+    """Bounded in-process cache with per-entry expiry and least-recently-used eviction"""
+    max_generations = 10000
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._generations = {}  # key -> invalidation count
+        self._epoch = 0
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def generation(self, key):
+        """Token to pass to set(); it changes whenever the key is invalidated"""
+        return (self._epoch, self._generations.get(key, 0))
+
+    def set(self, key, value, generation=None):
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        # Invalidated while the value was being read, so it may predate the write
+        if generation is not None and generation != self.generation(key):
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        if key is None:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
+        else:
+            self._entries.pop(key, None)
+            if len(self._generations) >= self.max_generations:
+                # A new epoch keeps counts restarting from zero from matching older tokens
+                self._generations.clear()
+                self._epoch += 1
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+# Conditional responses - weak ETags derived from the inquiry revision counter
+def weak_etag(*parts) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+def cache_headers(etag: str) -> dict:
+    # no-cache lets browsers keep the body but revalidate it with If-None-Match on every request
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
+
+# Per-worker cache of single inquiries keyed by id. Status updates invalidate locally; with
+# MONGO_CHANGE_STREAMS enabled every worker also invalidates on writes from other workers,
+# otherwise INQUIRY_CACHE_TTL bounds how stale another worker's copy can be
+INQUIRY_CACHE_SIZE = int(os.environ.get('INQUIRY_CACHE_SIZE', '256'))
+INQUIRY_CACHE_TTL = float(os.environ.get('INQUIRY_CACHE_TTL', '30'))
+inquiry_cache = TTLCache(ttl=INQUIRY_CACHE_TTL, maxsize=INQUIRY_CACHE_SIZE)
+
+# Short-lived cache so uptime monitors polling /api/status don't hit Mongo on every request
+STATUS_CACHE_TTL = float(os.environ.get('STATUS_CACHE_TTL', '5'))
+status_cache = TTLCache(ttl=STATUS_CACHE_TTL, maxsize=64)
+
 @api_router.post("/status", response_model=StatusCheck)
 async def create_status_check(input: StatusCheckCreate):
     status_dict = input.dict()
     status_obj = StatusCheck(**status_dict)
     _ = await db.status_checks.insert_one(status_obj.dict())
+    status_cache.invalidate()
     return status_obj
 
 @api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
+async def get_status_checks(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """
+    Get status checks newest first, optionally limited to a time range.
+    When more results exist, the X-Next-Cursor header holds the cursor for the next page.
+    """
+    cache_key = (since, until, limit, cursor)
+    cached = status_cache.get(cache_key)
+    if cached is None:
+        generation = status_cache.generation(cache_key)
+        query = {}
+        if since or until:
+            query["timestamp"] = time_range(since, until)
+        if cursor:
+            query.update(after_cursor(cursor, "timestamp"))
+        
+        # Fetch one extra item to find out whether another page exists
+        status_checks = await db.status_checks.find(query, STATUS_CHECK_PROJECTION).sort(
+            [("timestamp", -1), ("id", -1)]
+        ).limit(limit + 1).to_list(limit + 1)
+        next_cursor = None
+        if len(status_checks) > limit:
+            status_checks = status_checks[:limit]
+            next_cursor = encode_cursor(status_checks[-1]["timestamp"], status_checks[-1]["id"])
+        cached = (orjson.dumps(status_checks), next_cursor)
+        status_cache.set(cache_key, cached, generation)
+    
+    body, next_cursor = cached
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    return Response(body, media_type="application/json", headers=headers)
 
 # Contact Form Endpoints
+# Idempotency keys - the first request with a key claims it, replays get its stored response
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', str(24 * 60 * 60)))
+IDEMPOTENCY_WAIT_SECONDS = 5.0
+IDEMPOTENCY_LOCK_SECONDS = 60
+
+def request_fingerprint(payload: BaseModel) -> str:
+    return hashlib.sha256(orjson.dumps(payload.dict(), option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+async def claim_idempotency_key(key: str, fingerprint: str) -> Optional[dict]:
+    """
+    Claim the key for this request and return None, or return the stored
+    response of the request that already completed under it.
+    """
+    now = datetime.utcnow()
+    try:
+        await db.idempotency_keys.insert_one(
+            {"_id": key, "fingerprint": fingerprint, "response": None, "created_at": now, "locked_at": now}
+        )
+        return None
+    except DuplicateKeyError:
+        pass
+
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        record = await db.idempotency_keys.find_one({"_id": key})
+        if record is None:
+            # Expired or released by a failed request - try to claim it again
+            return await claim_idempotency_key(key, fingerprint)
+        if record["fingerprint"] != fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+        if record["response"] is not None:
+            return record["response"]
+
+        # Take over keys whose owner died before finishing
+        stale = await db.idempotency_keys.update_one(
+            {"_id": key, "response": None,
+             "locked_at": {"$lt": datetime.utcnow() - timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS)}},
+            {"$set": {"locked_at": datetime.utcnow()}}
+        )
+        if stale.modified_count:
+            return None
+        if time.monotonic() >= deadline:
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+        await asyncio.sleep(0.1)
+
+async def complete_idempotency_key(key: str, response: BaseModel):
+    await db.idempotency_keys.update_one({"_id": key}, {"$set": {"response": response.dict()}})
+
+async def release_idempotency_key(key: str):
+    await db.idempotency_keys.delete_one({"_id": key, "response": None})
+
 @api_router.post("/contact/inquiry", response_model=ContactInquiryResponse)
-async def create_contact_inquiry(inquiry: ContactInquiryCreate):
+async def create_contact_inquiry(
+    inquiry: ContactInquiryCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
+):
     """
-    Create a new contact inquiry for building inspection services
+    Create a new contact inquiry for building inspection services.
+    Retries carrying the same Idempotency-Key return the original response
+    without storing the inquiry or sending emails again.
     """
+    if idempotency_key:
+        stored_response = await claim_idempotency_key(idempotency_key, request_fingerprint(inquiry))
+        if stored_response is not None:
+            return ContactInquiryResponse(**stored_response)
+    
     try:
         # Create the inquiry object
         inquiry_data = inquiry.dict()
         contact_inquiry = ContactInquiry(**inquiry_data)
         
         # Insert into MongoDB
-        result = await db.contact_inquiries.insert_one(contact_inquiry.dict())
+        result = await db.contact_inquiries.insert_one(inquiry_document(contact_inquiry))
         
         if result.inserted_id:
             # Log the inquiry for monitoring
             logger.info(f"New contact inquiry created: {contact_inquiry.id} from {inquiry.email}")
             
-            # Send emails asynchronously
             try:
-                # Send business notification email
-                business_subject, business_html, business_text = create_business_notification_email(contact_inquiry)
-                business_email_sent = await send_email_async(
-                    GMAIL_EMAIL,
-                    business_subject,
-                    business_html,
-                    business_text
-                )
-                
-                # Send customer confirmation email
-                customer_subject, customer_html, customer_text = create_customer_confirmation_email(contact_inquiry)
-                customer_email_sent = await send_email_async(
-                    inquiry.email,
-                    customer_subject,
-                    customer_html,
-                    customer_text
-                )
-                
-                if business_email_sent:
-                    logger.info(f"Business notification email sent for inquiry {contact_inquiry.id}")
-                else:
-                    logger.error(f"Failed to send business notification email for inquiry {contact_inquiry.id}")
-                
-                if customer_email_sent:
-                    logger.info(f"Customer confirmation email sent to {inquiry.email} for inquiry {contact_inquiry.id}")
-                else:
-                    logger.error(f"Failed to send customer confirmation email to {inquiry.email} for inquiry {contact_inquiry.id}")
-                    
+                await record_inquiries_created([contact_inquiry])
+            except Exception as e:
+                logger.error(f"Failed to update stats counters for inquiry {contact_inquiry.id}: {str(e)}")
+            try:
+                await record_rollup_inquiries([contact_inquiry])
+            except Exception as e:
+                logger.error(f"Failed to update rollups for inquiry {contact_inquiry.id}: {str(e)}")
+            publish_inquiry_created(contact_inquiry.dict())
+            
+            # Queue emails for the background dispatcher
+            try:
+                await enqueue_inquiry_emails(contact_inquiry)
             except Exception as email_error:
-                logger.error(f"Email sending error for inquiry {contact_inquiry.id}: {str(email_error)}")
+                logger.error(f"Failed to queue emails for inquiry {contact_inquiry.id}: {str(email_error)}")
                 # Don't fail the inquiry creation if emails fail
             
-            return ContactInquiryResponse(
+            response = ContactInquiryResponse(
                 id=contact_inquiry.id,
                 message="Your inspection request has been submitted successfully! We'll contact you within 2 hours to confirm your appointment. You should also receive a confirmation email shortly.",
                 status="success"
             )
+            if idempotency_key:
+                try:
+                    await complete_idempotency_key(idempotency_key, response)
+                except Exception as e:
+                    logger.error(f"Failed to store idempotent response for inquiry {contact_inquiry.id}: {str(e)}")
+            return response
         else:
             raise HTTPException(status_code=500, detail="Failed to create inquiry")
             
     except Exception as e:
         logger.error(f"Error creating contact inquiry: {str(e)}")
+        if idempotency_key:
+            try:
+                await release_idempotency_key(idempotency_key)
+            except Exception as release_error:
+                logger.error(f"Failed to release Idempotency-Key: {str(release_error)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+MAX_BULK_INQUIRIES = int(os.environ.get('MAX_BULK_INQUIRIES', '100'))
+
+@api_router.post("/contact/inquiries/bulk", response_model=BulkInquiryResponse)
+async def create_contact_inquiries_bulk(items: List[dict] = Body(..., max_length=MAX_BULK_INQUIRIES)):
+    """
+    Create a batch of contact inquiries, reporting success or failure per item
+    """
+    results = [BulkInquiryResult(index=index, status="error") for index in range(len(items))]
+    
+    # Validate each item on its own so one bad lead doesn't reject the batch
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, ContactInquiry(**ContactInquiryCreate(**item).dict())))
+        except ValidationError as e:
+            results[index].error = "; ".join(
+                f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
+    
+    try:
+        failed_positions = {}
+        if valid:
+            try:
+                await db.contact_inquiries.insert_many(
+                    [inquiry_document(inquiry) for _, inquiry in valid],
+                    ordered=False
+                )
+            except BulkWriteError as e:
+                failed_positions = {error["index"]: error["errmsg"] for error in e.details["writeErrors"]}
+        
+        created = []
+        for position, (index, inquiry) in enumerate(valid):
+            if position in failed_positions:
+                results[index].error = "Failed to store inquiry"
+                logger.error(f"Failed to store bulk inquiry {inquiry.id}: {failed_positions[position]}")
+            else:
+                results[index].id = inquiry.id
+                results[index].status = "success"
+                results[index].error = None
+                created.append(inquiry)
+        
+        if created:
+            logger.info(f"Bulk created {len(created)} contact inquiries")
+            try:
+                await record_inquiries_created(created)
+            except Exception as e:
+                logger.error(f"Failed to update stats counters for bulk inquiries: {str(e)}")
+            try:
+                await record_rollup_inquiries(created)
+            except Exception as e:
+                logger.error(f"Failed to update rollups for bulk inquiries: {str(e)}")
+            for inquiry in created:
+                publish_inquiry_created(inquiry.dict())
+            try:
+                await enqueue_batch_emails(created)
+            except Exception as email_error:
+                logger.error(f"Failed to queue emails for bulk inquiries: {str(email_error)}")
+                # Don't fail the inquiry creation if emails fail
+        
+        return BulkInquiryResponse(created=len(created), failed=len(items) - len(created), results=results)
+        
+    except Exception as e:
+        logger.error(f"Error creating bulk contact inquiries: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+def inquiry_filters(
+    status: Optional[InquiryStatus] = None,
+    inspection_type: Optional[InspectionType] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    preferred_from: Optional[date] = None,
+    preferred_to: Optional[date] = None
+) -> dict:
+    """List filters as a Mongo query; every combination is backed by a contact_inquiries index"""
+    query = {}
+    if status:
+        query["status"] = status
+    if inspection_type:
+        query["inspection_type"] = inspection_type
+    if created_from or created_to:
+        query["created_at"] = time_range(created_from, created_to)
+    if preferred_from or preferred_to:
+        # Preferred dates are stored as YYYY-MM-DD strings, which sort chronologically
+        bounds = {}
+        if preferred_from:
+            bounds["$gte"] = preferred_from.isoformat()
+        if preferred_to:
+            bounds["$lte"] = preferred_to.isoformat()
+        query["preferred_date"] = bounds
+    return query
+
+def inquiry_projection(
+    fields: Optional[str] = Query(None, description="Comma-separated inquiry fields to return")
+) -> dict:
+    if not fields:
+        return INQUIRY_PROJECTION
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in INQUIRY_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    # Pages resume from the last item's created_at and id, so those are always returned
+    return {"_id": 0, "id": 1, "created_at": 1, **{field: 1 for field in requested}}
+
+async def fetch_inquiry_page(query: dict, limit: int, cursor: Optional[str], projection: dict = INQUIRY_PROJECTION) -> tuple:
+    """One page of inquiries newest first, plus the cursor for the next page if there is one"""
+    if cursor:
+        query = {**query, **after_cursor(cursor)}
+    
+    # Fetch one extra item to find out whether another page exists
+    inquiries = await db.contact_inquiries.find(query, projection).sort(
+        [("created_at", -1), ("id", -1)]
+    ).limit(limit + 1).to_list(limit + 1)
+    if len(inquiries) > limit:
+        inquiries = inquiries[:limit]
+        return inquiries, encode_cursor(inquiries[-1]["created_at"], inquiries[-1]["id"])
+    return inquiries, None
+
 @api_router.get("/contact/inquiries", response_model=List[ContactInquiry])
-async def get_contact_inquiries(status: Optional[InquiryStatus] = None, limit: int = 50):
+async def get_contact_inquiries(
+    request: Request,
+    query: dict = Depends(inquiry_filters),
+    projection: dict = Depends(inquiry_projection),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
     """
-    Get all contact inquiries with optional status filtering
+    Get contact inquiries newest first, optionally filtered by status, inspection type,
+    created_at range and preferred date range, and limited to the given fields.
+    When more results exist, the X-Next-Cursor header holds the cursor for the next page.
     """
     try:
-        query = {}
-        if status:
-            query["status"] = status
-            
-        inquiries = await db.contact_inquiries.find(query).sort("created_at", -1).limit(limit).to_list(limit)
-        return [ContactInquiry(**inquiry) for inquiry in inquiries]
+        etag = weak_etag("inquiries", await current_revision(), query, projection, limit, cursor)
+        if etag_matches(request, etag):
+            return not_modified(etag)
         
+        inquiries, next_cursor = await fetch_inquiry_page(query, limit, cursor, projection)
+        headers = cache_headers(etag)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return ORJSONResponse(inquiries, headers=headers)
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching contact inquiries: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch inquiries")
 
+# Search - ranked text search over name, email and address, or phone number prefix search
+PHONE_QUERY = re.compile(r"[\d\s()+.-]+")
+MIN_PHONE_PREFIX_DIGITS = 3
+MIN_SEARCH_TERM_LENGTH = 3
+# Email tokens shared by most addresses, which narrow a phrase search by almost nothing
+COMMON_EMAIL_TERMS = {"com", "net", "org", "edu", "gov", "gmail", "hotmail", "outlook", "yahoo", "icloud", "bigpond"}
+# Text pages are skips into a sorted result, so the depth a client can page to is bounded
+MAX_SEARCH_OFFSET = int(os.environ.get('MAX_SEARCH_OFFSET', '1000'))
+
+def phone_prefixes(query: str) -> List[str]:
+    """Normalized prefixes to look up, allowing the leading 0 to be left off"""
+    digits = normalize_phone(query)
+    if digits.startswith("61"):
+        digits = "0" + digits[2:]
+    prefixes = [digits]
+    if not digits.startswith("0"):
+        prefixes.append("0" + digits)
+    return prefixes
+
+async def search_by_phone(query: str, base_query: dict, limit: int, cursor: Optional[str], projection: dict) -> tuple:
+    """Inquiries whose phone starts with the query digits, in phone_digits order"""
+    search_query = {**base_query, "phone_digits": {"$in": [
+        re.compile("^" + re.escape(prefix)) for prefix in phone_prefixes(query)
+    ]}}
+    if cursor:
+        try:
+            payload = decode_token(cursor)
+            phone_digits, item_id = str(payload["p"]), str(payload["i"])
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        search_query["$or"] = [
+            {"phone_digits": {"$gt": phone_digits}},
+            {"phone_digits": phone_digits, "id": {"$gt": item_id}},
+        ]
+    
+    documents = await db.contact_inquiries.find(
+        search_query, {**projection, "phone_digits": 1}
+    ).sort([("phone_digits", ASCENDING), ("id", ASCENDING)]).limit(limit + 1).to_list(limit + 1)
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = encode_token({"p": documents[-1]["phone_digits"], "i": documents[-1]["id"]})
+    for document in documents:
+        del document["phone_digits"]
+    return documents, next_cursor
+
+async def search_by_text(query: str, base_query: dict, limit: int, cursor: Optional[str], projection: dict) -> tuple:
+    """Inquiries matching the text index, best score first"""
+    if "@" in query:
+        # Email addresses tokenize into their parts, so match them as a phrase; it still needs
+        # one selective part, or the phrase check runs over every address on the same domain
+        if not any(
+            len(term) >= MIN_SEARCH_TERM_LENGTH and term.lower() not in COMMON_EMAIL_TERMS
+            for term in re.findall(r"\w+", query)
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Email searches need a name or domain part of at least {MIN_SEARCH_TERM_LENGTH} characters"
+            )
+        search = f'"{query.replace(chr(34), "")}"'
+    else:
+        # One- and two-letter terms match most of the index, and every match is scored and sorted
+        terms = [term for term in query.split() if len(term) >= MIN_SEARCH_TERM_LENGTH]
+        if not terms:
+            raise HTTPException(
+                status_code=400, detail=f"Search terms must be at least {MIN_SEARCH_TERM_LENGTH} characters"
+            )
+        search = " ".join(terms)
+    offset = 0
+    if cursor:
+        try:
+            offset = int(decode_token(cursor)["o"])
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if offset < 0:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if offset >= MAX_SEARCH_OFFSET:
+            raise HTTPException(
+                status_code=400, detail=f"Search results are limited to the first {MAX_SEARCH_OFFSET}; refine the query"
+            )
+    
+    # Text matches have no index order to resume from, so pages are offsets into the ranking
+    documents = await db.contact_inquiries.find(
+        {**base_query, "$text": {"$search": search}}, {**projection, "score": {"$meta": "textScore"}}
+    ).sort([
+        ("score", {"$meta": "textScore"}), ("created_at", DESCENDING), ("id", DESCENDING)
+    ]).skip(offset).limit(limit + 1).to_list(limit + 1)
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        if offset + limit < MAX_SEARCH_OFFSET:
+            next_cursor = encode_token({"o": offset + limit})
+    return documents, next_cursor
+
+@api_router.get("/contact/inquiries/search")
+async def search_contact_inquiries(
+    q: str = Query(..., min_length=MIN_SEARCH_TERM_LENGTH, max_length=200),
+    status: Optional[InquiryStatus] = None,
+    projection: dict = Depends(inquiry_projection),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """
+    Search inquiries by name, email, street or phone number.
+    A query made of digits and phone punctuation is a phone prefix search; anything else is
+    ranked by the text index and each result carries its score; terms shorter than
+    MIN_SEARCH_TERM_LENGTH are ignored and paging stops at MAX_SEARCH_OFFSET results.
+    When more results exist, the X-Next-Cursor header holds the cursor for the next page.
+    """
+    try:
+        base_query = {"status": status} if status else {}
+        query = q.strip()
+        if PHONE_QUERY.fullmatch(query) and len(normalize_phone(query)) >= MIN_PHONE_PREFIX_DIGITS:
+            inquiries, next_cursor = await search_by_phone(query, base_query, limit, cursor, projection)
+        else:
+            inquiries, next_cursor = await search_by_text(query, base_query, limit, cursor, projection)
+        
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return ORJSONResponse(inquiries, headers=headers)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching contact inquiries: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to search inquiries")
+
+# Streaming export
+EXPORT_FIELDS = INQUIRY_FIELDS
+EXPORT_BATCH_SIZE = 500
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+def export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+async def export_rows(cursor, export_format: ExportFormat):
+    """Yield encoded rows from a Motor cursor, coalesced into chunks of about EXPORT_CHUNK_BYTES"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == ExportFormat.CSV:
+        writer.writerow(EXPORT_FIELDS)
+    async for inquiry in cursor:
+        if export_format == ExportFormat.CSV:
+            writer.writerow([export_value(inquiry.get(field)) for field in EXPORT_FIELDS])
+        else:
+            buffer.write(json.dumps({field: export_value(inquiry.get(field)) for field in EXPORT_FIELDS}))
+            buffer.write("\n")
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+async def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+@api_router.get("/contact/inquiries/export")
+async def export_contact_inquiries(
+    format: ExportFormat = ExportFormat.NDJSON,
+    query: dict = Depends(inquiry_filters),
+    gzip: bool = False
+):
+    """
+    Stream all matching contact inquiries as NDJSON or CSV, optionally gzip-compressed
+    """
+    cursor = db.contact_inquiries.find(query, INQUIRY_PROJECTION).sort(
+        [("created_at", -1), ("id", -1)]
+    ).batch_size(EXPORT_BATCH_SIZE)
+
+    body = export_rows(cursor, format)
+    filename = f"inquiries.{format.value}"
+    media_type = "text/csv" if format == ExportFormat.CSV else "application/x-ndjson"
+    if gzip:
+        body = gzip_chunks(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @api_router.get("/contact/inquiry/{inquiry_id}", response_model=ContactInquiry)
 async def get_contact_inquiry(inquiry_id: str):
     """
     Get a specific contact inquiry by ID
+    
+    Reads are serialized straight from the projected document; the
+    response_model only documents the shape.
     """
     try:
-        inquiry = await db.contact_inquiries.find_one({"id": inquiry_id})
-        if not inquiry:
-            raise HTTPException(status_code=404, detail="Inquiry not found")
-        return ContactInquiry(**inquiry)
+        body = inquiry_cache.get(inquiry_id)
+        if body is None:
+            generation = inquiry_cache.generation(inquiry_id)
+            inquiry = await db.contact_inquiries.find_one({"id": inquiry_id}, INQUIRY_PROJECTION)
+            if not inquiry:
+                raise HTTPException(status_code=404, detail="Inquiry not found")
+            body = orjson.dumps(inquiry)
+            inquiry_cache.set(inquiry_id, body, generation)
+        return Response(body, media_type="application/json")
         
     except HTTPException:
         raise
@@ -460,15 +1952,33 @@ async def update_inquiry_status(inquiry_id: str, status: InquiryStatus):
     Update the status of a contact inquiry
     """
     try:
-        result = await db.contact_inquiries.update_one(
+        # Read the previous status atomically with the update so counters move the right buckets
+        updated_at = datetime.utcnow()
+        previous = await db.contact_inquiries.find_one_and_update(
             {"id": inquiry_id},
-            {"$set": {"status": status, "updated_at": datetime.utcnow()}}
+            {"$set": {"status": status, "updated_at": updated_at}},
+            projection={"_id": 0, "status": 1, "inspection_type": 1, "created_at": 1},
+            return_document=ReturnDocument.BEFORE
         )
         
-        if result.matched_count == 0:
+        if previous is None:
             raise HTTPException(status_code=404, detail="Inquiry not found")
+        inquiry_cache.invalidate(inquiry_id)
+        
+        previous_status = InquiryStatus(previous["status"]).value
+        try:
+            await record_status_change(previous_status, status.value)
+        except Exception as e:
+            logger.error(f"Failed to update stats counters for inquiry {inquiry_id}: {str(e)}")
+        try:
+            await record_rollup_status_changes(
+                [(previous["created_at"], previous["inspection_type"], previous_status, status.value)]
+            )
+        except Exception as e:
+            logger.error(f"Failed to update rollups for inquiry {inquiry_id}: {str(e)}")
+        publish_inquiry_status(inquiry_id, previous_status, status.value, updated_at)
             
-        return {"message": f"Inquiry status updated to {status}", "status": "success"}
+        return {"message": f"Inquiry status updated to {status}", "status": "success", "previous_status": previous_status}
         
     except HTTPException:
         raise
@@ -476,54 +1986,782 @@ async def update_inquiry_status(inquiry_id: str, status: InquiryStatus):
         logger.error(f"Error updating inquiry status {inquiry_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update inquiry status")
 
-# Statistics endpoint
+MAX_BULK_STATUS_UPDATES = int(os.environ.get('MAX_BULK_STATUS_UPDATES', '200'))
+# Recent bulk writes remembered per inquiry, so overlapping batches can each find their own updates
+BULK_WRITE_IDS_KEPT = 5
+
+@api_router.patch("/contact/inquiries/status", response_model=BulkStatusResponse)
+async def update_inquiry_statuses(
+    updates: List[InquiryStatusUpdate] = Body(..., max_length=MAX_BULK_STATUS_UPDATES)
+):
+    """
+    Apply a batch of status changes in one unordered bulk write, reporting the result per id.
+    Each update only applies if the inquiry still has the status read before the write, so
+    an id changed concurrently is reported as a conflict rather than miscounted.
+    """
+    # An id listed twice is ambiguous, so none of its updates are applied
+    seen, duplicates = set(), set()
+    for update in updates:
+        (duplicates if update.id in seen else seen).add(update.id)
+    requested = {update.id: update.status.value for update in updates if update.id not in duplicates}
+    results = {}
+    
+    try:
+        ids = list(requested)
+        previous, buckets = {}, {}
+        async for document in db.contact_inquiries.find(
+            {"id": {"$in": ids}}, {"_id": 0, "id": 1, "status": 1, "inspection_type": 1, "created_at": 1}
+        ):
+            previous[document["id"]] = InquiryStatus(document["status"]).value
+            buckets[document["id"]] = (document["created_at"], document["inspection_type"])
+        for inquiry_id in ids:
+            if inquiry_id not in previous:
+                results[inquiry_id] = BulkStatusResult(id=inquiry_id, status="not_found", error="Inquiry not found")
+        
+        pending = [inquiry_id for inquiry_id in ids if inquiry_id in previous]
+        updated_at = datetime.utcnow()
+        # Tags the updates this request applied; later writes to the same ids leave it in place
+        bulk_write_id = str(uuid.uuid4())
+        applied = set()
+        if pending:
+            write_errors = {}
+            try:
+                outcome = await db.contact_inquiries.bulk_write([
+                    UpdateOne(
+                        {"id": inquiry_id, "status": previous[inquiry_id]},
+                        {
+                            "$set": {"status": requested[inquiry_id], "updated_at": updated_at},
+                            "$push": {"bulk_write_ids": {"$each": [bulk_write_id], "$slice": -BULK_WRITE_IDS_KEPT}}
+                        }
+                    )
+                    for inquiry_id in pending
+                ], ordered=False)
+                matched = outcome.matched_count
+            except BulkWriteError as e:
+                write_errors = {pending[error["index"]]: error["errmsg"] for error in e.details["writeErrors"]}
+                matched = e.details["nMatched"]
+            
+            if matched == len(pending):
+                applied = set(pending)
+            else:
+                # Some filters missed: find which updates landed by this request's tag
+                applied = {
+                    document["id"]
+                    async for document in db.contact_inquiries.find(
+                        {"id": {"$in": pending}, "bulk_write_ids": bulk_write_id}, {"_id": 0, "id": 1}
+                    )
+                }
+            
+            for inquiry_id in pending:
+                if inquiry_id in applied:
+                    results[inquiry_id] = BulkStatusResult(
+                        id=inquiry_id, status="success", previous_status=previous[inquiry_id]
+                    )
+                elif inquiry_id in write_errors:
+                    logger.error(f"Failed to update status of inquiry {inquiry_id}: {write_errors[inquiry_id]}")
+                    results[inquiry_id] = BulkStatusResult(
+                        id=inquiry_id, status="error", error="Failed to update inquiry status"
+                    )
+                else:
+                    results[inquiry_id] = BulkStatusResult(
+                        id=inquiry_id, status="conflict", error="Inquiry status changed concurrently"
+                    )
+        
+        if applied:
+            logger.info(f"Bulk updated status of {len(applied)} contact inquiries")
+            for inquiry_id in applied:
+                inquiry_cache.invalidate(inquiry_id)
+            try:
+                await record_status_changes([(previous[inquiry_id], requested[inquiry_id]) for inquiry_id in applied])
+            except Exception as e:
+                logger.error(f"Failed to update stats counters for bulk status update: {str(e)}")
+            try:
+                await record_rollup_status_changes([
+                    (*buckets[inquiry_id], previous[inquiry_id], requested[inquiry_id]) for inquiry_id in applied
+                ])
+            except Exception as e:
+                logger.error(f"Failed to update rollups for bulk status update: {str(e)}")
+            for inquiry_id in pending:
+                if inquiry_id in applied:
+                    publish_inquiry_status(inquiry_id, previous[inquiry_id], requested[inquiry_id], updated_at)
+        
+        return BulkStatusResponse(
+            updated=len(applied),
+            failed=len(updates) - len(applied),
+            results=[
+                results.get(update.id) or BulkStatusResult(id=update.id, status="error", error="Duplicate id in request")
+                for update in updates
+            ]
+        )
+        
+    except Exception as e:
+        logger.error(f"Error bulk updating inquiry statuses: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to update inquiry statuses")
+
+@api_router.get("/contact/events")
+async def stream_contact_events(request: Request):
+    """
+    Server-sent events stream of inquiry changes for the admin dashboard.
+    Events are inquiry.created (the new inquiry) and inquiry.status
+    (id, previous_status, status, updated_at), so clients can patch their
+    list and stats in place instead of re-fetching them. previous_status is
+    null when events come from a change stream.
+    """
+    async def event_stream():
+        queue = inquiry_events.subscribe()
+        try:
+            yield f"retry: {EVENT_KEEPALIVE_SECONDS * 1000}\n\n".encode()
+            while not await request.is_disconnected():
+                try:
+                    sequence, event_type, data = await asyncio.wait_for(queue.get(), EVENT_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield b"id: %d\nevent: %s\ndata: %s\n\n" % (sequence, event_type.encode(), orjson.dumps(data))
+        finally:
+            inquiry_events.unsubscribe(queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Statistics endpoint - counters are maintained incrementally on every write
+# and rebuilt from contact_inquiries by a periodic reconciliation job
+STATS_COUNTERS_ID = "contact_inquiries"
+STATS_RECONCILE_INTERVAL = float(os.environ.get('STATS_RECONCILE_INTERVAL', '3600'))
+RECENT_WINDOW = timedelta(days=7)
+HOUR_BUCKET_FORMAT = "%Y-%m-%dT%H"
+
+def build_contact_stats_pipeline(since: datetime) -> list:
+    """Single-pass aggregation producing every stats bucket in one round trip"""
+    return [
+        {"$project": {"_id": 0, "status": 1, "inspection_type": 1, "created_at": 1}},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "inspection_type": [{"$group": {"_id": "$inspection_type", "count": {"$sum": 1}}}],
+            "hourly": [
+                {"$match": {"created_at": {"$gte": since}}},
+                {"$group": {
+                    "_id": {"$dateToString": {"format": HOUR_BUCKET_FORMAT, "date": "$created_at"}},
+                    "count": {"$sum": 1}
+                }},
+            ],
+        }},
+    ]
+
+STATS_RECONCILE_ATTEMPTS = 3
+
+async def reconcile_stats_counters() -> dict:
+    """Rebuild the counters document from scratch, dropping hourly buckets outside the recent window.
+    
+    The rebuild only lands if no counter write happened since the revision was read, so an $inc
+    racing the aggregation is never overwritten; after repeated races the counters are left as they
+    are until the next run. A write whose inquiry is already visible to the aggregation but whose
+    $inc lands after the rebuild is still counted twice until then.
+    """
+    for _ in range(STATS_RECONCILE_ATTEMPTS):
+        current = await db.stats_counters.find_one({"_id": STATS_COUNTERS_ID}, {"revision": 1})
+        since = (datetime.utcnow() - RECENT_WINDOW).replace(minute=0, second=0, microsecond=0)
+        results = await db.contact_inquiries.aggregate(build_contact_stats_pipeline(since)).to_list(1)
+        facets = results[0] if results else {}
+        
+        total = facets.get("total")
+        counters = {
+            "total": total[0]["count"] if total else 0,
+            "status": {
+                InquiryStatus(bucket["_id"]).value: bucket["count"]
+                for bucket in facets.get("status", []) if bucket["_id"]
+            },
+            "inspection_type": {
+                InspectionType(bucket["_id"]).value: bucket["count"]
+                for bucket in facets.get("inspection_type", []) if bucket["_id"]
+            },
+            "hourly": {bucket["_id"]: bucket["count"] for bucket in facets.get("hourly", [])},
+            "reconciled_at": datetime.utcnow(),
+        }
+        
+        if current is None:
+            try:
+                counters.update({"_id": STATS_COUNTERS_ID, "revision": 1})
+                await db.stats_counters.insert_one(counters)
+                return counters
+            except DuplicateKeyError:
+                continue
+        
+        # Keep the revision monotonic across rebuilds so ETags handed out earlier never match again
+        rebuilt = await db.stats_counters.find_one_and_update(
+            {"_id": STATS_COUNTERS_ID, "revision": current.get("revision", 0)},
+            {"$set": counters, "$inc": {"revision": 1}},
+            return_document=ReturnDocument.AFTER
+        )
+        if rebuilt is not None:
+            return rebuilt
+    
+    logger.warning("Stats counters changed during every reconcile attempt, keeping the current counters")
+    return await db.stats_counters.find_one({"_id": STATS_COUNTERS_ID})
+
+async def reconcile_stats_counters_once():
+    """Rebuild counters that earlier releases may have created from deltas alone"""
+    if not await db.schema_migrations.find_one({"_id": "stats_counters"}):
+        await reconcile_stats_counters()
+        await db.schema_migrations.update_one(
+            {"_id": "stats_counters"}, {"$set": {"applied_at": datetime.utcnow()}}, upsert=True
+        )
+
+async def record_inquiries_created(inquiries: List[ContactInquiry]):
+    increments = {"total": len(inquiries), "revision": 1}
+    for inquiry in inquiries:
+        for key in (
+            f"status.{inquiry.status.value}",
+            f"inspection_type.{inquiry.inspection_type.value}",
+            f"hourly.{inquiry.created_at.strftime(HOUR_BUCKET_FORMAT)}",
+        ):
+            increments[key] = increments.get(key, 0) + 1
+    # No upsert: a missing document is rebuilt from the collection on first read instead
+    await db.stats_counters.update_one({"_id": STATS_COUNTERS_ID}, {"$inc": increments})
+
+async def record_status_change(old_status: str, new_status: str):
+    await record_status_changes([(old_status, new_status)])
+
+async def record_status_changes(transitions: List[tuple]):
+    """Apply a batch of (old_status, new_status) transitions to the counters in one update"""
+    increments = {"revision": 1}
+    for old_status, new_status in transitions:
+        if old_status != new_status:
+            increments[f"status.{old_status}"] = increments.get(f"status.{old_status}", 0) - 1
+            increments[f"status.{new_status}"] = increments.get(f"status.{new_status}", 0) + 1
+    await db.stats_counters.update_one({"_id": STATS_COUNTERS_ID}, {"$inc": increments})
+
+async def current_revision() -> int:
+    """Revision bumped on every inquiry write, used to version cached responses"""
+    counters = await db.stats_counters.find_one({"_id": STATS_COUNTERS_ID}, {"revision": 1})
+    if counters is None:
+        counters = await reconcile_stats_counters()
+    return counters.get("revision", 0) if counters else 0
+
+async def reconcile_stats_periodically():
+    while True:
+        try:
+            await reconcile_stats_counters()
+        except Exception as e:
+            logger.error(f"Failed to reconcile stats counters: {str(e)}")
+        await asyncio.sleep(STATS_RECONCILE_INTERVAL)
+
+async def load_stats_counters() -> dict:
+    counters = await db.stats_counters.find_one({"_id": STATS_COUNTERS_ID})
+    if counters is None:
+        counters = await reconcile_stats_counters()
+    return counters
+
+def recent_window_cutoff() -> str:
+    # The 7-day window moves every hour even when nothing is written
+    return (datetime.utcnow() - RECENT_WINDOW).strftime(HOUR_BUCKET_FORMAT)
+
+def contact_stats_from_counters(counters: dict, cutoff: str) -> dict:
+    # Count by status
+    status_counts = {status.value: 0 for status in InquiryStatus}
+    for status, count in counters.get("status", {}).items():
+        if status in status_counts:
+            status_counts[status] = count
+    
+    # Count by inspection type
+    inspection_type_counts = {inspection_type.value: 0 for inspection_type in InspectionType}
+    for inspection_type, count in counters.get("inspection_type", {}).items():
+        if inspection_type in inspection_type_counts:
+            inspection_type_counts[inspection_type] = count
+    
+    # Recent inquiries (last 7 days, to hour granularity)
+    recent_inquiries = sum(
+        count for hour, count in counters.get("hourly", {}).items() if hour >= cutoff
+    )
+    
+    return {
+        "total_inquiries": counters.get("total", 0),
+        "status_breakdown": status_counts,
+        "inspection_type_breakdown": inspection_type_counts,
+        "recent_inquiries_7_days": recent_inquiries
+    }
+
 @api_router.get("/contact/stats")
-async def get_contact_stats():
+async def get_contact_stats(request: Request):
     """
     Get statistics about contact inquiries
     """
     try:
-        total_inquiries = await db.contact_inquiries.count_documents({})
-        
-        # Count by status
-        status_counts = {}
-        for status in InquiryStatus:
-            count = await db.contact_inquiries.count_documents({"status": status})
-            status_counts[status.value] = count
-        
-        # Count by inspection type
-        inspection_type_counts = {}
-        for inspection_type in InspectionType:
-            count = await db.contact_inquiries.count_documents({"inspection_type": inspection_type})
-            inspection_type_counts[inspection_type.value] = count
-        
-        # Recent inquiries (last 7 days)
-        seven_days_ago = datetime.utcnow().timestamp() - (7 * 24 * 60 * 60)
-        recent_inquiries = await db.contact_inquiries.count_documents({
-            "created_at": {"$gte": datetime.fromtimestamp(seven_days_ago)}
-        })
+        counters = await load_stats_counters()
+        cutoff = recent_window_cutoff()
+        etag = weak_etag("stats", counters.get("revision", 0), cutoff)
+        if etag_matches(request, etag):
+            return not_modified(etag)
         
-        return {
-            "total_inquiries": total_inquiries,
-            "status_breakdown": status_counts,
-            "inspection_type_breakdown": inspection_type_counts,
-            "recent_inquiries_7_days": recent_inquiries
-        }
+        return ORJSONResponse(contact_stats_from_counters(counters, cutoff), headers=cache_headers(etag))
         
     except Exception as e:
         logger.error(f"Error fetching contact stats: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch statistics")
 
+@api_router.get("/contact/dashboard")
+async def get_contact_dashboard(
+    request: Request,
+    query: dict = Depends(inquiry_filters),
+    projection: dict = Depends(inquiry_projection),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    """
+    Inquiry list page and stats for the admin dashboard in one response with one ETag.
+    Both are versioned by the stats counter revision, so a single counter read serves the
+    ETag check and the stats. Revalidating clients read it first and usually get a 304;
+    otherwise it is read concurrently with the list query.
+    """
+    try:
+        if request.headers.get("if-none-match"):
+            counters = await load_stats_counters()
+            page = None
+        else:
+            counters, page = await asyncio.gather(
+                load_stats_counters(), fetch_inquiry_page(query, limit, cursor, projection)
+            )
+        
+        cutoff = recent_window_cutoff()
+        etag = weak_etag("dashboard", counters.get("revision", 0), cutoff, query, projection, limit, cursor)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        inquiries, next_cursor = page if page is not None else await fetch_inquiry_page(query, limit, cursor, projection)
+        return ORJSONResponse({
+            "inquiries": inquiries,
+            "next_cursor": next_cursor,
+            "stats": contact_stats_from_counters(counters, cutoff)
+        }, headers=cache_headers(etag))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching contact dashboard: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch dashboard")
+
+# Volume rollups - one document per UTC day of created_at, counting inquiries by inspection type and
+# current status; status changes move counts within the day the inquiry was created
+DAY_BUCKET_FORMAT = "%Y-%m-%d"
+MAX_ROLLUP_DAYS = int(os.environ.get('MAX_ROLLUP_DAYS', '731'))
+ROLLUP_BACKFILL_WINDOW_DAYS = int(os.environ.get('ROLLUP_BACKFILL_WINDOW_DAYS', '31'))
+ROLLUP_REBUILD_ATTEMPTS = 3
+rollup_backfill_task = None
+
+class RollupGranularity(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+
+def rollup_key(inspection_type, status) -> str:
+    return f"counts.{InspectionType(inspection_type).value}.{InquiryStatus(status).value}"
+
+async def apply_rollup_increments(increments: dict):
+    """Apply {day: {counter path: delta}} to the rollup documents in one unordered bulk write"""
+    updates = [
+        # Every increment bumps the version, so a rebuild that read an older one does not overwrite it
+        UpdateOne({"_id": day}, {"$inc": {**deltas, "version": 1}, "$set": {"updated_at": datetime.utcnow()}}, upsert=True)
+        for day, deltas in increments.items() if deltas
+    ]
+    if updates:
+        await db.inquiry_rollups.bulk_write(updates, ordered=False)
+
+async def record_rollup_inquiries(inquiries: List[ContactInquiry]):
+    increments = {}
+    for inquiry in inquiries:
+        deltas = increments.setdefault(inquiry.created_at.strftime(DAY_BUCKET_FORMAT), {})
+        key = rollup_key(inquiry.inspection_type, inquiry.status)
+        deltas[key] = deltas.get(key, 0) + 1
+        deltas["total"] = deltas.get("total", 0) + 1
+    await apply_rollup_increments(increments)
+
+async def record_rollup_status_changes(changes: List[tuple]):
+    """Apply (created_at, inspection_type, old_status, new_status) changes to the rollups"""
+    increments = {}
+    for created_at, inspection_type, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        deltas = increments.setdefault(created_at.strftime(DAY_BUCKET_FORMAT), {})
+        for key, delta in ((rollup_key(inspection_type, old_status), -1), (rollup_key(inspection_type, new_status), 1)):
+            deltas[key] = deltas.get(key, 0) + delta
+    await apply_rollup_increments(increments)
+
+async def aggregate_rollup_window(start: datetime, end: datetime) -> dict:
+    """Rollup contents for the days in [start, end), computed from contact_inquiries"""
+    days = {}
+    async for bucket in db.contact_inquiries.aggregate([
+        {"$match": {"created_at": {"$gte": start, "$lt": end}}},
+        {"$group": {
+            "_id": {
+                "day": {"$dateToString": {"format": DAY_BUCKET_FORMAT, "date": "$created_at"}},
+                "inspection_type": "$inspection_type",
+                "status": "$status",
+            },
+            "count": {"$sum": 1}
+        }},
+    ]):
+        day = days.setdefault(bucket["_id"]["day"], {"total": 0, "counts": {}})
+        inspection_type = InspectionType(bucket["_id"]["inspection_type"]).value
+        status = InquiryStatus(bucket["_id"]["status"]).value
+        day["counts"].setdefault(inspection_type, {})[status] = bucket["count"]
+        day["total"] += bucket["count"]
+    return days
+
+async def rebuild_rollup_window(start: datetime, end: datetime) -> int:
+    """Recompute the rollup documents for days in [start, end) from contact_inquiries.
+    
+    Each day is only replaced or deleted if its version is still the one read before the
+    aggregation, so increments racing the rebuild are never overwritten; those days are
+    rebuilt again, and left as they are after ROLLUP_REBUILD_ATTEMPTS. As with the stats
+    counters, an inquiry the aggregation already sees whose increment lands after the
+    replace is counted twice until the next rebuild.
+    """
+    window = {"$gte": start.strftime(DAY_BUCKET_FORMAT), "$lt": end.strftime(DAY_BUCKET_FORMAT)}
+    pending = None
+    for _ in range(ROLLUP_REBUILD_ATTEMPTS):
+        versions = {
+            # Rollups written before versioning have none, which a None filter matches
+            rollup["_id"]: rollup.get("version")
+            async for rollup in db.inquiry_rollups.find({"_id": window}, {"version": 1})
+        }
+        days = await aggregate_rollup_window(start, end)
+        stale = set(days) | set(versions)
+        if pending is not None:
+            stale &= pending
+        if not stale:
+            return 0
+        
+        rebuild_id = str(uuid.uuid4())
+        now = datetime.utcnow()
+        writes = []
+        for day in stale:
+            if day not in days:
+                writes.append(DeleteOne({"_id": day, "version": versions[day]}))
+            elif day in versions:
+                writes.append(ReplaceOne(
+                    {"_id": day, "version": versions[day]},
+                    {**days[day], "version": (versions[day] or 0) + 1, "rebuild_id": rebuild_id, "updated_at": now}
+                ))
+            else:
+                writes.append(InsertOne(
+                    {"_id": day, **days[day], "version": 1, "rebuild_id": rebuild_id, "updated_at": now}
+                ))
+        try:
+            await db.inquiry_rollups.bulk_write(writes, ordered=False)
+        except BulkWriteError:
+            # An increment created the day first; it is retried below
+            pass
+        
+        # Days whose rebuild landed carry this rebuild's id, deleted days are gone
+        landed = {
+            rollup["_id"]: rollup.get("rebuild_id")
+            async for rollup in db.inquiry_rollups.find({"_id": {"$in": list(stale)}}, {"rebuild_id": 1})
+        }
+        pending = {
+            day for day in stale
+            if (day in days and landed.get(day) != rebuild_id) or (day not in days and day in landed)
+        }
+        if not pending:
+            return len(days)
+    
+    logger.warning(f"Rollups for {sorted(pending)} changed during every rebuild attempt, keeping them as they are")
+    return len(days)
+
+async def backfill_inquiry_rollups():
+    """Rebuild every rollup from contact_inquiries, one window of days at a time"""
+    try:
+        oldest = await db.contact_inquiries.find({}, {"_id": 0, "created_at": 1}).sort("created_at", ASCENDING).limit(1).to_list(1)
+        newest = await db.contact_inquiries.find({}, {"_id": 0, "created_at": 1}).sort("created_at", DESCENDING).limit(1).to_list(1)
+        rebuilt = 0
+        if oldest:
+            start = oldest[0]["created_at"].replace(hour=0, minute=0, second=0, microsecond=0)
+            last = newest[0]["created_at"]
+            while start <= last:
+                end = start + timedelta(days=ROLLUP_BACKFILL_WINDOW_DAYS)
+                rebuilt += await rebuild_rollup_window(start, end)
+                start = end
+        await db.schema_migrations.update_one(
+            {"_id": "inquiry_rollups"}, {"$set": {"applied_at": datetime.utcnow(), "days": rebuilt}}, upsert=True
+        )
+        logger.info(f"Backfilled inquiry rollups for {rebuilt} days")
+    except Exception as e:
+        logger.error(f"Failed to backfill inquiry rollups: {str(e)}")
+
+async def backfill_inquiry_rollups_once():
+    """Build rollups for inquiries stored before rollups existed"""
+    if not await db.schema_migrations.find_one({"_id": "inquiry_rollups"}):
+        await backfill_inquiry_rollups()
+
+def rollup_bucket_start(day: date, granularity: RollupGranularity) -> date:
+    # Weeks start on Monday
+    return day - timedelta(days=day.weekday()) if granularity == RollupGranularity.WEEK else day
+
+@api_router.get("/contact/analytics/volume")
+async def get_inquiry_volume(
+    granularity: RollupGranularity = RollupGranularity.DAY,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    inspection_type: Optional[InspectionType] = None,
+    status: Optional[InquiryStatus] = None
+):
+    """
+    Inquiry volume per day or week (by created date, UTC) with inspection type and status breakdowns.
+    Defaults to the last 30 days; weekly buckets start on Monday and every bucket in range is returned.
+    """
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days >= MAX_ROLLUP_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range is limited to {MAX_ROLLUP_DAYS} days")
+    
+    try:
+        buckets = {}
+        bucket_day = rollup_bucket_start(start, granularity)
+        step = timedelta(days=7 if granularity == RollupGranularity.WEEK else 1)
+        while bucket_day <= end:
+            buckets[bucket_day] = {
+                "start": bucket_day.isoformat(),
+                "total": 0,
+                "inspection_type": {value.value: 0 for value in InspectionType},
+                "status": {value.value: 0 for value in InquiryStatus},
+            }
+            bucket_day += step
+        
+        async for rollup in db.inquiry_rollups.find(
+            {"_id": {"$gte": start.isoformat(), "$lte": end.isoformat()}}
+        ):
+            bucket = buckets[rollup_bucket_start(date.fromisoformat(rollup["_id"]), granularity)]
+            for type_value, statuses in rollup.get("counts", {}).items():
+                if inspection_type and type_value != inspection_type.value:
+                    continue
+                for status_value, count in statuses.items():
+                    if status and status_value != status.value:
+                        continue
+                    bucket["total"] += count
+                    bucket["inspection_type"][type_value] = bucket["inspection_type"].get(type_value, 0) + count
+                    bucket["status"][status_value] = bucket["status"].get(status_value, 0) + count
+        
+        return {
+            "granularity": granularity.value,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "buckets": list(buckets.values())
+        }
+        
+    except Exception as e:
+        logger.error(f"Error fetching inquiry volume: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch inquiry volume")
+
+# Admin endpoints - disabled unless ADMIN_API_TOKEN is set
+ADMIN_API_TOKEN = os.environ.get('ADMIN_API_TOKEN', '')
+MAX_PROFILE_REQUESTS = int(os.environ.get('MAX_PROFILE_REQUESTS', '100'))
+
+class RouteProfileRequest(BaseModel):
+    route: str
+    method: str = "GET"
+    requests: int = Field(1, ge=0, le=MAX_PROFILE_REQUESTS)
+
+def require_admin(token: Optional[str]):
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    if not token or not hmac.compare_digest(token, ADMIN_API_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+def profile_status() -> dict:
+    captured = sorted(
+        (path.name for path in PROFILE_DIR.glob("*") if path.suffix in (".json", ".prof")),
+        reverse=True
+    ) if PROFILE_DIR.is_dir() else []
+    return {
+        "profiler": "pyinstrument" if pyinstrument is not None else "cProfile",
+        "armed": dict(profile_targets),
+        "directory": str(PROFILE_DIR),
+        "captured": captured,
+    }
+
+@api_router.post("/admin/profile")
+async def arm_route_profile(
+    profile: RouteProfileRequest,
+    admin_token: Optional[str] = Header(None, alias="X-Admin-Token")
+):
+    """
+    Profile the next N requests to a route, given as its template (e.g. /api/contact/stats).
+    Sending requests=0 disarms the route.
+    """
+    require_admin(admin_token)
+    method = profile.method.upper()
+    if not any(
+        isinstance(route, TimedRoute) and route.path == profile.route and method in route.methods
+        for route in app.routes
+    ):
+        raise HTTPException(status_code=404, detail=f"No route {method} {profile.route}")
+    
+    key = f"{method} {profile.route}"
+    if profile.requests:
+        profile_targets[key] = profile.requests
+        logger.info(f"Profiling the next {profile.requests} requests to {key}")
+    else:
+        profile_targets.pop(key, None)
+    return profile_status()
+
+@api_router.get("/admin/profile")
+async def get_route_profiles(admin_token: Optional[str] = Header(None, alias="X-Admin-Token")):
+    """
+    Armed routes and the profiles written so far
+    """
+    require_admin(admin_token)
+    return profile_status()
+
+@api_router.get("/admin/query-plans")
+async def get_query_plans(admin_token: Optional[str] = Header(None, alias="X-Admin-Token")):
+    """
+    Explain every hot-path query, including each list filter combination, and report
+    the ones the planner answers with a collection scan
+    """
+    require_admin(admin_token)
+    try:
+        scans = await find_collection_scans()
+    except Exception as e:
+        logger.error(f"Error explaining hot-path queries: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to explain queries")
+    return ORJSONResponse({
+        "checked": len(HOT_PATH_QUERIES),
+        "collection_scans": [
+            {"collection": collection_name, "query": query, "sort": sort}
+            for collection_name, query, sort in scans
+        ]
+    })
+
+@api_router.post("/admin/rollups/backfill", status_code=202)
+async def start_rollup_backfill(admin_token: Optional[str] = Header(None, alias="X-Admin-Token")):
+    """
+    Rebuild the inquiry volume rollups from contact_inquiries in the background
+    """
+    global rollup_backfill_task
+    require_admin(admin_token)
+    if rollup_backfill_task is not None and not rollup_backfill_task.done():
+        raise HTTPException(status_code=409, detail="A rollup backfill is already running")
+    rollup_backfill_task = asyncio.create_task(backfill_inquiry_rollups())
+    background_tasks.append(rollup_backfill_task)
+    return {"message": "Rollup backfill started", "status": "success"}
+
 # Include the router in the main app
 app.include_router(api_router)
 
+register_metric(Gauge(
+    "email_executor_queue_depth", "Email sends waiting for an executor thread", (),
+    lambda: {(): email_executor._work_queue.qsize()}
+))
+register_metric(Gauge(
+    "email_executor_threads", "Threads started by the email executor", (),
+    lambda: {(): len(email_executor._threads)}
+))
+register_metric(Gauge(
+    "email_outbox_inflight", "Outbox messages currently being delivered", (),
+    lambda: {(): len(outbox_inflight)}
+))
+register_metric(Gauge(
+    "smtp_pool_idle_sessions", "Authenticated SMTP sessions idle in the pool", ("transport",),
+    lambda: {
+        ("executor",): len(smtp_pool._idle),
+        ("asyncio",): len(async_smtp_pool._idle) if async_smtp_pool is not None else 0,
+    }
+))
+register_metric(Gauge(
+    "cache_hits_total", "Cache hits since startup", ("cache",),
+    lambda: {("inquiry",): inquiry_cache.hits, ("status",): status_cache.hits},
+    kind="counter"
+))
+register_metric(Gauge(
+    "cache_misses_total", "Cache misses since startup", ("cache",),
+    lambda: {("inquiry",): inquiry_cache.misses, ("status",): status_cache.misses},
+    kind="counter"
+))
+register_metric(Gauge(
+    "cache_hit_ratio", "Cache hits as a fraction of lookups since startup", ("cache",),
+    lambda: {
+        (name,): round(cache.hits / (cache.hits + cache.misses), 4) if cache.hits + cache.misses else 0
+        for name, cache in (("inquiry", inquiry_cache), ("status", status_cache))
+    }
+))
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware timing each request against its route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                status_code
+            )
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware adding a Server-Timing header with the request's phase durations"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timing = RequestTiming()
+        token = request_timing.set(timing)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.header().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_timing.reset(token)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "Server-Timing"],
 )
+app.add_middleware(RequestMetricsMiddleware)
+if SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
 
 # Configure logging
 logging.basicConfig(
@@ -532,6 +2770,236 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def prune_smtp_pool():
+    """Periodically close SMTP sessions that have sat idle too long"""
+    loop = asyncio.get_event_loop()
+    while True:
+        await asyncio.sleep(SMTP_POOL_IDLE_TIMEOUT)
+        try:
+            await loop.run_in_executor(email_executor, smtp_pool.prune_idle)
+            if async_smtp_pool is not None:
+                await async_smtp_pool.prune_idle()
+        except Exception as e:
+            logger.error(f"Failed to prune SMTP pool: {str(e)}")
+
+background_tasks = []
+
+# Index declarations - bump INDEX_SCHEMA_VERSION whenever these change
+INDEX_SCHEMA_VERSION = 8
+
+INDEX_DECLARATIONS = {
+    "contact_inquiries": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        # List filters: equality fields first, then the (created_at, id) sort every page uses
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("inspection_type", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("inspection_type", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("preferred_date", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)]),
+        # Names weigh most; no language so names and streets are neither stemmed nor stop-worded
+        IndexModel(
+            [("name", TEXT), ("email", TEXT), ("property_address", TEXT)],
+            name="inquiry_text", weights={"name": 10, "email": 5, "property_address": 3}, default_language="none"
+        ),
+        IndexModel([("phone_digits", ASCENDING), ("id", ASCENDING)]),
+        # Sparse: only inquiries whose emails have not reached the outbox carry the field
+        IndexModel([("emails_pending_since", ASCENDING)], sparse=True),
+    ],
+    "status_checks": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("timestamp", DESCENDING), ("id", DESCENDING)]),
+    ],
+    "email_outbox": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("locked_until", ASCENDING)]),
+        IndexModel([("inquiry_ids", ASCENDING)]),
+        # finished_at is only set on sent and dead messages; the filter keeps pending ones out of the index
+        IndexModel(
+            [("finished_at", ASCENDING)], expireAfterSeconds=OUTBOX_RETENTION_SECONDS,
+            partialFilterExpression={"finished_at": {"$exists": True}}
+        ),
+    ],
+    "idempotency_keys": [
+        IndexModel([("created_at", ASCENDING)], expireAfterSeconds=IDEMPOTENCY_TTL_SECONDS),
+    ],
+}
+
+def index_spec(index: dict) -> tuple:
+    """Comparable (key, unique, TTL, partial filter) tuple for an IndexModel document or index_information entry"""
+    key = index["key"].items() if isinstance(index["key"], dict) else index["key"]
+    expire_after = index.get("expireAfterSeconds")
+    if "weights" in index:
+        # The server reports text indexes as _fts/_ftsx keys; compare their weighted fields instead
+        key = [(field, f"text:{int(weight)}") for field, weight in sorted(index["weights"].items())]
+    return (
+        [(field, int(direction) if isinstance(direction, float) else direction) for field, direction in key],
+        bool(index.get("unique")),
+        int(expire_after) if expire_after is not None else None,
+        dict(index.get("partialFilterExpression") or {}),
+    )
+
+async def reconcile_collection_indexes(collection_name: str, models: list) -> dict:
+    """Create missing indexes, rebuild changed ones and drop undeclared ones"""
+    collection = db[collection_name]
+    existing = await collection.index_information()
+    declared = {model.document["name"]: model for model in models}
+    changes = {"created": [], "dropped": []}
+
+    for name, info in existing.items():
+        if name == "_id_":
+            continue
+        if name not in declared or index_spec(info) != index_spec(declared[name].document):
+            await collection.drop_index(name)
+            changes["dropped"].append(name)
+
+    missing = [model for name, model in declared.items()
+               if name not in existing or name in changes["dropped"]]
+    if missing:
+        changes["created"] = await collection.create_indexes(missing)
+    return changes
+
+# One sample value per list filter; every combination of them is checked below
+LIST_FILTER_SAMPLES = inquiry_filters(
+    status=InquiryStatus.NEW,
+    inspection_type=InspectionType.PRE_PURCHASE,
+    created_from=datetime(1970, 1, 1),
+    created_to=datetime(2100, 1, 1),
+    preferred_from=date(1970, 1, 1),
+    preferred_to=date(2100, 1, 1)
+)
+
+# Hot-path queries that must be served by an index
+HOT_PATH_QUERIES = [
+    ("contact_inquiries", {"id": ""}, None),
+    *(
+        ("contact_inquiries", dict(filters), [("created_at", DESCENDING), ("id", DESCENDING)])
+        for size in range(len(LIST_FILTER_SAMPLES) + 1)
+        for filters in itertools.combinations(LIST_FILTER_SAMPLES.items(), size)
+    ),
+    ("contact_inquiries", {"inspection_type": InspectionType.PRE_PURCHASE}, None),
+    ("contact_inquiries", {"created_at": {"$gte": datetime(1970, 1, 1)}}, None),
+    ("contact_inquiries", {"preferred_date": "1970-01-01"}, None),
+    ("contact_inquiries", {"phone_digits": {"$regex": "^04"}}, [("phone_digits", ASCENDING), ("id", ASCENDING)]),
+    ("contact_inquiries", {"$text": {"$search": "inspection"}}, None),
+    ("status_checks", {"id": ""}, None),
+    ("status_checks", {}, [("timestamp", DESCENDING), ("id", DESCENDING)]),
+    ("status_checks", {"timestamp": {"$gte": datetime(1970, 1, 1)}}, [("timestamp", DESCENDING), ("id", DESCENDING)]),
+    ("email_outbox", {"id": ""}, None),
+    ("contact_inquiries", {"emails_pending_since": {"$lte": datetime(1970, 1, 1)}}, [("emails_pending_since", ASCENDING)]),
+    ("email_outbox", {"inquiry_ids": ""}, None),
+]
+
+def plan_stages(plan) -> set:
+    """Collect every stage name in an explain() plan tree"""
+    stages = set()
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.add(plan["stage"])
+        for value in plan.values():
+            stages |= plan_stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            stages |= plan_stages(value)
+    return stages
+
+async def find_collection_scans() -> list:
+    """Explain each hot-path query and return the ones that fall back to COLLSCAN"""
+    scans = []
+    for collection_name, query, sort in HOT_PATH_QUERIES:
+        command = {"find": collection_name, "filter": query, "limit": 1}
+        if sort:
+            command["sort"] = dict(sort)
+        explain = await db.command({"explain": command, "verbosity": "queryPlanner"})
+        if "COLLSCAN" in plan_stages(explain["queryPlanner"]["winningPlan"]):
+            scans.append((collection_name, query, sort))
+    return scans
+
+async def bootstrap_indexes():
+    """Reconcile declared indexes once per INDEX_SCHEMA_VERSION"""
+    applied = await db.schema_migrations.find_one({"_id": "indexes"})
+    if applied and applied.get("version") == INDEX_SCHEMA_VERSION:
+        return
+
+    for collection_name, models in INDEX_DECLARATIONS.items():
+        changes = await reconcile_collection_indexes(collection_name, models)
+        if changes["created"] or changes["dropped"]:
+            logger.info(f"Reconciled indexes on {collection_name}: created {changes['created']}, dropped {changes['dropped']}")
+
+    await db.schema_migrations.update_one(
+        {"_id": "indexes"},
+        {"$set": {"version": INDEX_SCHEMA_VERSION, "applied_at": datetime.utcnow()}},
+        upsert=True
+    )
+    logger.info(f"Index schema upgraded to version {INDEX_SCHEMA_VERSION}")
+
+    for collection_name, query, sort in await find_collection_scans():
+        logger.warning(f"Query on {collection_name} {query} sort {sort} uses a collection scan")
+
+PHONE_BACKFILL_BATCH_SIZE = 1000
+
+async def backfill_phone_digits():
+    """Add phone_digits to inquiries stored before phone search existed, in id order batches"""
+    try:
+        if await db.schema_migrations.find_one({"_id": "phone_digits"}):
+            return
+        last_id, updated = "", 0
+        while True:
+            batch = await db.contact_inquiries.find(
+                {"id": {"$gt": last_id}}, {"_id": 0, "id": 1, "phone": 1, "phone_digits": 1}
+            ).sort("id", ASCENDING).limit(PHONE_BACKFILL_BATCH_SIZE).to_list(PHONE_BACKFILL_BATCH_SIZE)
+            if not batch:
+                break
+            last_id = batch[-1]["id"]
+            updates = [
+                UpdateOne({"id": document["id"]}, {"$set": {"phone_digits": normalize_phone(document.get("phone") or "")}})
+                for document in batch if "phone_digits" not in document
+            ]
+            if updates:
+                await db.contact_inquiries.bulk_write(updates, ordered=False)
+                updated += len(updates)
+        await db.schema_migrations.update_one(
+            {"_id": "phone_digits"}, {"$set": {"applied_at": datetime.utcnow(), "updated": updated}}, upsert=True
+        )
+        logger.info(f"Backfilled phone_digits on {updated} inquiries")
+    except Exception as e:
+        logger.error(f"Failed to backfill phone_digits: {str(e)}")
+
+@app.on_event("startup")
+async def start_background_tasks():
+    if EMAIL_TRANSPORT == "asyncio" and async_smtp_pool is None:
+        logger.warning("aiosmtplib is not installed, sending email through the executor transport")
+    try:
+        await bootstrap_indexes()
+    except Exception as e:
+        logger.error(f"Failed to bootstrap indexes: {str(e)}")
+    # Before serving, so counters built from deltas alone by earlier releases never reach a client
+    # and one-off rebuilds do not race live traffic on a first deploy
+    try:
+        await reconcile_stats_counters_once()
+    except Exception as e:
+        logger.error(f"Failed to rebuild stats counters: {str(e)}")
+    try:
+        await backfill_inquiry_rollups_once()
+    except Exception as e:
+        logger.error(f"Failed to backfill inquiry rollups: {str(e)}")
+    background_tasks.append(asyncio.create_task(prune_smtp_pool()))
+    background_tasks.append(asyncio.create_task(dispatch_outbox()))
+    background_tasks.append(asyncio.create_task(recover_pending_emails_periodically()))
+    background_tasks.append(asyncio.create_task(reconcile_stats_periodically()))
+    background_tasks.append(asyncio.create_task(backfill_phone_digits()))
+    if MONGO_CHANGE_STREAMS:
+        background_tasks.append(asyncio.create_task(watch_inquiry_changes()))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for task in background_tasks:
+        task.cancel()
+    # Let cancelled deliveries hand their messages back before the client closes
+    for task in list(outbox_inflight):
+        task.cancel()
+    await asyncio.gather(*outbox_inflight, return_exceptions=True)
+    smtp_pool.close_all()
+    if async_smtp_pool is not None:
+        await async_smtp_pool.close_all()
     client.close()
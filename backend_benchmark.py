@@ -0,0 +1,709 @@
+#!/usr/bin/env python3
+"""
+Load-test and benchmark harness for the Safe Building Inspections API.
+
+Runs backend.server.app in-process through httpx's ASGI transport against
+mongomock (or a real MongoDB with --mongo-url) and a local fake SMTP server
+with configurable latency. Reports req/s and p50/p95/p99 latency per
+endpoint at several concurrency levels, saves the results as JSON and exits
+non-zero when results regress against a stored baseline.
+
+    python backend_benchmark.py --concurrency 1 10 50 --requests 500
+    python backend_benchmark.py --seed 100000 --scenarios stats
+    python backend_benchmark.py --mongo-url mongodb://localhost:27017 --seed 1000000 --scenarios stats dashboard
+    python backend_benchmark.py --mongo-url mongodb://localhost:27017 --seed 1000000 --scenarios search_text search_phone
+    python backend_benchmark.py --scenarios create_inquiry --email-transport executor
+    python backend_benchmark.py --save-baseline benchmark_baseline.json
+    python backend_benchmark.py --baseline benchmark_baseline.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+ROOT_DIR = Path(__file__).parent
+
+SAMPLE_INQUIRY = {
+    "name": "Benchmark Customer",
+    "email": "customer@example.com",
+    "phone": "0412345678",
+    "property_address": "123 Collins Street, Melbourne VIC 3000",
+    "inspection_type": "pre-purchase",
+    "preferred_date": "2025-06-01",
+    "message": "Please call in the morning."
+}
+
+INSPECTION_TYPES = ["pre-purchase", "new-home"]
+STATUSES = ["new", "contacted", "scheduled", "completed", "cancelled"]
+FIRST_NAMES = ["Olivia", "Jack", "Charlotte", "William", "Amelia", "Noah", "Isla", "Oliver", "Mia", "Thomas"]
+LAST_NAMES = ["Smith", "Jones", "Williams", "Brown", "Wilson", "Taylor", "Nguyen", "Johnson", "Martin", "White",
+              "Anderson", "Walker", "Thompson", "Harris", "Lee", "Ryan", "Robinson", "Kelly", "King", "Davis"]
+STREETS = ["Collins Street", "Chapel Street", "Sydney Road", "Glenferrie Road", "High Street",
+           "Lygon Street", "Brunswick Street", "Smith Street", "Bridge Road", "Toorak Road"]
+
+# $text is not implemented by mongomock
+MONGO_ONLY_SCENARIOS = {"search_text"}
+
+
+class FakeSMTPServer:
+    """Minimal SMTP server that accepts everything, sleeping `latency` seconds per message"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.messages = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        writer.write(b"220 localhost fake SMTP\r\n")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line[:4].upper()
+                if command == b"EHLO":
+                    writer.write(b"250-localhost\r\n250-AUTH PLAIN LOGIN\r\n250 OK\r\n")
+                elif command == b"AUTH":
+                    writer.write(b"235 Authentication successful\r\n")
+                elif command == b"DATA":
+                    writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    await writer.drain()
+                    while (await reader.readline()) not in (b".\r\n", b""):
+                        pass
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    self.messages += 1
+                    writer.write(b"250 Message accepted\r\n")
+                elif command == b"QUIT":
+                    writer.write(b"221 Bye\r\n")
+                    await writer.drain()
+                    break
+                else:
+                    writer.write(b"250 OK\r\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_load(client, make_request, total, concurrency):
+    """Issue `total` requests with at most `concurrency` in flight and summarise latencies"""
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for index in remaining:
+            started = time.perf_counter()
+            response = await make_request(client, index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "requests_per_second": round(total / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def build_scenarios(inquiry_ids):
+    """Endpoint scenarios as name -> async request callable"""
+    async def health(client, index):
+        return await client.get("/api/")
+
+    async def create_inquiry(client, index):
+        return await client.post("/api/contact/inquiry", json=SAMPLE_INQUIRY)
+
+    async def list_inquiries(client, index):
+        return await client.get("/api/contact/inquiries", params={"limit": 200})
+
+    async def get_inquiry(client, index):
+        return await client.get(f"/api/contact/inquiry/{inquiry_ids[index % len(inquiry_ids)]}")
+
+    async def stats(client, index):
+        return await client.get("/api/contact/stats")
+
+    async def dashboard(client, index):
+        return await client.get("/api/contact/dashboard")
+
+    async def volume(client, index):
+        return await client.get("/api/contact/analytics/volume", params={"granularity": "week", "start": "2025-01-01"})
+
+    async def search_text(client, index):
+        query = LAST_NAMES[index % len(LAST_NAMES)] + " " + STREETS[index % len(STREETS)].split()[0]
+        return await client.get("/api/contact/inquiries/search", params={"q": query})
+
+    async def search_phone(client, index):
+        return await client.get("/api/contact/inquiries/search", params={"q": f"04{index % 10000:04d}"})
+
+    async def status_checks(client, index):
+        return await client.get("/api/status")
+
+    return {
+        "health": health,
+        "create_inquiry": create_inquiry,
+        "list_inquiries": list_inquiries,
+        "get_inquiry": get_inquiry,
+        "stats": stats,
+        "dashboard": dashboard,
+        "volume": volume,
+        "search_text": search_text,
+        "search_phone": search_phone,
+        "status_checks": status_checks,
+    }
+
+
+async def seed_inquiries(db, count, batch_size=10000):
+    """Insert `count` synthetic inquiries spread over the last 90 days"""
+    now = datetime.utcnow()
+    ids = []
+    for start in range(0, count, batch_size):
+        batch = []
+        for offset in range(start, min(count, start + batch_size)):
+            created_at = now - timedelta(minutes=offset * 7 % (90 * 24 * 60))
+            inquiry_id = str(uuid.uuid4())
+            first_name = FIRST_NAMES[offset % len(FIRST_NAMES)]
+            last_name = LAST_NAMES[offset // len(FIRST_NAMES) % len(LAST_NAMES)]
+            phone = f"04{offset * 7919 % 100000000:08d}"
+            batch.append({
+                **SAMPLE_INQUIRY,
+                "id": inquiry_id,
+                "name": f"{first_name} {last_name}",
+                "email": f"{first_name.lower()}.{last_name.lower()}{offset}@example.com",
+                "phone": phone,
+                "phone_digits": phone,
+                "property_address": f"{offset % 300 + 1} {STREETS[offset % len(STREETS)]}, Melbourne VIC 3000",
+                "inspection_type": INSPECTION_TYPES[offset % len(INSPECTION_TYPES)],
+                "status": STATUSES[offset % len(STATUSES)],
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+            ids.append(inquiry_id)
+        await db.contact_inquiries.insert_many(batch)
+    await db.status_checks.insert_many(
+        [{"id": str(uuid.uuid4()), "client_name": "monitor", "timestamp": now - timedelta(minutes=i)} for i in range(100)]
+    )
+    return ids
+
+
+def original_business_notification_email(inquiry) -> tuple:
+    """create_business_notification_email as it was before user-007: unescaped, labels built per render"""
+    subject = f"🏠 New Inspection Request - {inquiry.name}"
+    
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+            .header {{ background-color: #1e3a8a; color: white; padding: 20px; text-align: center; }}
+            .content {{ padding: 20px; }}
+            .info-table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
+            .info-table th, .info-table td {{ padding: 12px; text-align: left; border-bottom: 1px solid #ddd; }}
+            .info-table th {{ background-color: #f8f9fa; font-weight: bold; }}
+            .priority {{ background-color: #fff3cd; padding: 15px; border-left: 4px solid #ffc107; margin: 20px 0; }}
+            .footer {{ background-color: #f8f9fa; padding: 15px; text-align: center; font-size: 12px; color: #666; }}
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>🏠 SAFE BUILDING INSPECTIONS</h1>
+            <h2>New Inspection Request</h2>
+        </div>
+        
+        <div class="content">
+            <div class="priority">
+                <strong>⚡ Action Required:</strong> New inspection request received - respond within 2 hours as promised to customer.
+            </div>
+            
+            <h3>Customer Information:</h3>
+            <table class="info-table">
+                <tr><th>Name</th><td>{inquiry.name}</td></tr>
+                <tr><th>Email</th><td><a href="mailto:{inquiry.email}">{inquiry.email}</a></td></tr>
+                <tr><th>Phone</th><td><a href="tel:{inquiry.phone}">{inquiry.phone}</a></td></tr>
+                <tr><th>Property Address</th><td>{inquiry.property_address}</td></tr>
+                <tr><th>Inspection Type</th><td>{inquiry.inspection_type.replace('-', ' ').title()}</td></tr>
+                <tr><th>Preferred Date</th><td>{inquiry.preferred_date or 'Not specified'}</td></tr>
+                <tr><th>Submitted</th><td>{inquiry.created_at.strftime('%B %d, %Y at %I:%M %p')}</td></tr>
+            </table>
+            
+            {f'<h3>Customer Message:</h3><div style="background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin: 10px 0;"><em>"{inquiry.message}"</em></div>' if inquiry.message else ''}
+            
+            <h3>📋 Next Steps:</h3>
+            <ol>
+                <li><strong>Call customer within 2 hours:</strong> <a href="tel:{inquiry.phone}">{inquiry.phone}</a></li>
+                <li><strong>Confirm inspection details and scheduling</strong></li>
+                <li><strong>Send quote if needed</strong></li>
+                <li><strong>Update inquiry status in system</strong></li>
+            </ol>
+        </div>
+        
+        <div class="footer">
+            <p>This notification was sent automatically from your Safe Building Inspections website.</p>
+            <p>Inquiry ID: {inquiry.id}</p>
+        </div>
+    </body>
+    </html>
+    """
+    
+    text_content = f"""
+    NEW INSPECTION REQUEST - SAFE BUILDING INSPECTIONS
+    
+    ACTION REQUIRED: Respond within 2 hours as promised to customer.
+    
+    Customer Details:
+    - Name: {inquiry.name}
+    - Email: {inquiry.email}
+    - Phone: {inquiry.phone}
+    - Property: {inquiry.property_address}
+    - Type: {inquiry.inspection_type.replace('-', ' ').title()}
+    - Preferred Date: {inquiry.preferred_date or 'Not specified'}
+    - Submitted: {inquiry.created_at.strftime('%B %d, %Y at %I:%M %p')}
+    
+    {f'Customer Message: "{inquiry.message}"' if inquiry.message else ''}
+    
+    Next Steps:
+    1. Call customer: {inquiry.phone}
+    2. Confirm inspection details
+    3. Send quote if needed
+    4. Update status in system
+    
+    Inquiry ID: {inquiry.id}
+    """
+    
+    return subject, html_content, text_content
+
+
+def original_customer_confirmation_email(inquiry) -> tuple:
+    """create_customer_confirmation_email as it was before user-007"""
+    subject = f"✅ Inspection Request Received - Safe Building Inspections"
+    
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <style>
+            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+            .header {{ background-color: #1e3a8a; color: white; padding: 20px; text-align: center; }}
+            .content {{ padding: 20px; }}
+            .info-box {{ background-color: #e3f2fd; padding: 20px; border-radius: 8px; margin: 20px 0; }}
+            .contact-info {{ background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0; }}
+            .footer {{ background-color: #f8f9fa; padding: 15px; text-align: center; font-size: 12px; color: #666; }}
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>🏠 SAFE BUILDING INSPECTIONS</h1>
+            <p>know before you buy</p>
+        </div>
+        
+        <div class="content">
+            <h2>Hello {inquiry.name},</h2>
+            
+            <p>Thank you for choosing Safe Building Inspections! We've received your inspection request and will contact you within <strong>2 hours</strong> to confirm your appointment.</p>
+            
+            <div class="info-box">
+                <h3>📋 Your Request Details:</h3>
+                <p><strong>Property:</strong> {inquiry.property_address}</p>
+                <p><strong>Inspection Type:</strong> {inquiry.inspection_type.replace('-', ' ').title()}</p>
+                <p><strong>Preferred Date:</strong> {inquiry.preferred_date or 'To be discussed'}</p>
+                <p><strong>Reference ID:</strong> {inquiry.id}</p>
+            </div>
+            
+            <h3>🕐 What Happens Next?</h3>
+            <ol>
+                <li><strong>We'll call you within 2 hours</strong> to confirm your inspection details</li>
+                <li><strong>Schedule your inspection</strong> at a convenient time</li>
+                <li><strong>Professional inspection</strong> by our VBA registered experts</li>
+                <li><strong>Detailed report delivered</strong> within 24 hours</li>
+            </ol>
+            
+            <div class="contact-info">
+                <h3>📞 Need to Contact Us?</h3>
+                <p><strong>Phone:</strong> <a href="tel:0477167167">0477 167 167</a></p>
+                <p><strong>Email:</strong> <a href="mailto:info@safebuildinginspections.com.au">info@safebuildinginspections.com.au</a></p>
+                <p><strong>Service Area:</strong> All of Melbourne Metropolitan Area</p>
+            </div>
+            
+            <h3>🏅 Why Choose Safe Building Inspections?</h3>
+            <ul>
+                <li>✅ VBA Registered Building Practitioner</li>
+                <li>✅ HIA Member</li>
+                <li>✅ Over 20 Years Experience</li>
+                <li>✅ 5.0 Star Rating</li>
+                <li>✅ Comprehensive Reports with Photos</li>
+                <li>✅ Professional and Reliable Service</li>
+                <li>✅ Report Delivered within 24Hr</li>
+            </ul>
+            
+            <p>We look forward to helping you with your building inspection needs!</p>
+            
+            <p><strong>Best regards,</strong><br>
+            The Safe Building Inspections Team</p>
+        </div>
+        
+        <div class="footer">
+            <p>Safe Building Inspections | Melbourne, Victoria | 0477 167 167</p>
+            <p>This is an automated confirmation email. Please do not reply to this email.</p>
+        </div>
+    </body>
+    </html>
+    """
+    
+    text_content = f"""
+    SAFE BUILDING INSPECTIONS - INSPECTION REQUEST CONFIRMED
+    
+    Hello {inquiry.name},
+    
+    Thank you for choosing Safe Building Inspections! We've received your inspection request and will contact you within 2 HOURS to confirm your appointment.
+    
+    YOUR REQUEST DETAILS:
+    - Property: {inquiry.property_address}
+    - Inspection Type: {inquiry.inspection_type.replace('-', ' ').title()}
+    - Preferred Date: {inquiry.preferred_date or 'To be discussed'}
+    - Reference ID: {inquiry.id}
+    
+    WHAT HAPPENS NEXT:
+    1. We'll call you within 2 hours to confirm details
+    2. Schedule your inspection at a convenient time
+    3. Professional inspection by VBA registered experts
+    4. Detailed report delivered within 24 hours
+    
+    CONTACT US:
+    Phone: 0477 167 167
+    Email: info@safebuildinginspections.com.au
+    Service Area: All of Melbourne Metropolitan Area
+    
+    WHY CHOOSE SAFE BUILDING INSPECTIONS:
+    ✅ VBA Registered Building Practitioner
+    ✅ HIA Member  
+    ✅ Over 20 Years Experience
+    ✅ 5.0 Star Rating
+    ✅ Comprehensive Reports with Photos
+    ✅ Professional and Reliable Service
+    ✅ Report Delivered within 24Hr
+    
+    We look forward to helping you with your building inspection needs!
+    
+    Best regards,
+    The Safe Building Inspections Team
+    
+    Safe Building Inspections | Melbourne, Victoria | 0477 167 167
+    """
+    
+    return subject, html_content, text_content
+
+
+def benchmark_templates(server, iterations=10000):
+    """Microbenchmark of email rendering per inquiry, against the original unescaped renderers"""
+    inquiry = server.ContactInquiry(**SAMPLE_INQUIRY)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        original_business_notification_email(inquiry)
+        original_customer_confirmation_email(inquiry)
+    original_us = (time.perf_counter() - started) / iterations * 1e6
+    started = time.perf_counter()
+    for _ in range(iterations):
+        server.create_business_notification_email(inquiry)
+        server.create_customer_confirmation_email(inquiry)
+    render_us = (time.perf_counter() - started) / iterations * 1e6
+    return {
+        "original_us_per_inquiry": round(original_us, 3),
+        "render_us_per_inquiry": round(render_us, 3),
+        "speedup": round(original_us / render_us, 1)
+    }
+
+
+async def count_stats(server):
+    """The nine count_documents queries the stats endpoint ran before the $facet pipeline"""
+    collection = server.db.contact_inquiries
+    await collection.count_documents({})
+    for status in server.InquiryStatus:
+        await collection.count_documents({"status": status})
+    for inspection_type in server.InspectionType:
+        await collection.count_documents({"inspection_type": inspection_type})
+    await collection.count_documents({"created_at": {"$gte": datetime.utcnow() - server.RECENT_WINDOW}})
+
+
+async def benchmark_stats_reconcile(server, iterations=5):
+    """
+    Time the $facet stats aggregation against the per-status and per-type count_documents
+    loop it replaced, plus the full counters rebuild, over the seeded collection
+    """
+    since = datetime.utcnow() - server.RECENT_WINDOW
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await count_stats(server)
+    count_ms = (time.perf_counter() - started) / iterations * 1e3
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await server.db.contact_inquiries.aggregate(server.build_contact_stats_pipeline(since)).to_list(1)
+    aggregate_ms = (time.perf_counter() - started) / iterations * 1e3
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await server.reconcile_stats_counters()
+    reconcile_ms = (time.perf_counter() - started) / iterations * 1e3
+    return {
+        "inquiries": await server.db.contact_inquiries.count_documents({}),
+        "count_documents_ms": round(count_ms, 3),
+        "aggregate_ms": round(aggregate_ms, 3),
+        "speedup": round(count_ms / aggregate_ms, 1),
+        "reconcile_ms": round(reconcile_ms, 3),
+    }
+
+
+async def benchmark_list_serialization(server, count=500, iterations=200):
+    """
+    Microbenchmark of encoding one page of `count` inquiries: building models and letting
+    FastAPI validate and encode them through response_model, against ORJSONResponse on the
+    projected documents. Runs outside the API, whose page size is capped at MAX_PAGE_SIZE.
+    """
+    from typing import List
+
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+
+    now = datetime.utcnow()
+    documents = []
+    for offset in range(count):
+        inquiry = server.ContactInquiry(**SAMPLE_INQUIRY, created_at=now - timedelta(minutes=offset))
+        documents.append({
+            **inquiry.dict(),
+            "inspection_type": inquiry.inspection_type.value,
+            "status": inquiry.status.value,
+        })
+    field = create_response_field(name="benchmark_list", type_=List[server.ContactInquiry], mode="serialization")
+
+    async def models():
+        inquiries = [server.ContactInquiry(**document) for document in documents]
+        return JSONResponse(await serialize_response(field=field, response_content=inquiries)).body
+
+    def documents_as_is():
+        return ORJSONResponse(documents).body
+
+    if json.loads(await models()) != json.loads(documents_as_is()):
+        raise RuntimeError("Model and orjson list bodies differ")
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await models()
+    models_ms = (time.perf_counter() - started) / iterations * 1e3
+    started = time.perf_counter()
+    for _ in range(iterations):
+        documents_as_is()
+    orjson_ms = (time.perf_counter() - started) / iterations * 1e3
+    return {
+        "items": count,
+        "models_ms": round(models_ms, 3),
+        "orjson_ms": round(orjson_ms, 3),
+        "speedup": round(models_ms / orjson_ms, 1),
+    }
+
+
+async def measure_outbox_drain(server, smtp, started, sent_before, timeout=60.0):
+    """
+    Time until every email queued during the run has left the outbox.
+    `started` and `sent_before` are taken before the load, so emails the dispatcher
+    delivered while requests were still running are counted too.
+    """
+    load_finished = time.perf_counter()
+    while time.perf_counter() - load_finished < timeout:
+        pending = await server.db.email_outbox.count_documents({"status": {"$in": ["pending", "sending"]}})
+        if not pending:
+            break
+        await asyncio.sleep(0.05)
+    finished = time.perf_counter()
+    elapsed = finished - started
+    sent = smtp.messages - sent_before
+    return {
+        "emails_delivered": sent,
+        "drain_seconds": round(elapsed, 3),
+        "backlog_seconds": round(finished - load_finished, 3),
+        "emails_per_second": round(sent / elapsed, 2) if elapsed else None,
+    }
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Return human-readable regressions beyond `tolerance` (a fraction) against the baseline"""
+    regressions = []
+    for scenario, levels in baseline.get("results", {}).items():
+        for concurrency, expected in levels.items():
+            actual = results["results"].get(scenario, {}).get(concurrency)
+            if actual is None:
+                continue
+            if actual["requests_per_second"] < expected["requests_per_second"] * (1 - tolerance):
+                regressions.append(
+                    f"{scenario} @ {concurrency}: {actual['requests_per_second']} req/s "
+                    f"vs baseline {expected['requests_per_second']}"
+                )
+            if actual["p95_ms"] > expected["p95_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{scenario} @ {concurrency}: p95 {actual['p95_ms']} ms vs baseline {expected['p95_ms']} ms"
+                )
+    return regressions
+
+
+async def run_benchmarks(args):
+    smtp = FakeSMTPServer(latency=args.smtp_latency)
+    await smtp.start()
+
+    # The server reads its configuration at import time
+    os.environ.setdefault("MONGO_URL", args.mongo_url or "mongodb://localhost:27017")
+    os.environ.update({
+        "GMAIL_SMTP_SERVER": smtp.host,
+        "GMAIL_SMTP_PORT": str(smtp.port),
+        "GMAIL_SMTP_USE_TLS": "false",
+        "OUTBOX_POLL_INTERVAL": "0.1",
+        "STATUS_CACHE_TTL": str(args.status_cache_ttl),
+        "EMAIL_TRANSPORT": args.email_transport,
+    })
+    sys.path.insert(0, str(ROOT_DIR))
+    from backend import server
+
+    # Per-request log lines would dominate the measurements
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    server.logger.setLevel(logging.WARNING)
+
+    if args.mongo_url:
+        server.db = server.client[f"benchmark_{uuid.uuid4().hex[:8]}"]
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+        server.db = AsyncMongoMockClient()["benchmark"]
+
+    print(f"Seeding {args.seed} inquiries...")
+    inquiry_ids = await seed_inquiries(server.db, args.seed)
+    await server.start_background_tasks()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "mongo": "real" if args.mongo_url else "mongomock",
+            "seeded_inquiries": args.seed,
+            "smtp_latency_seconds": args.smtp_latency,
+            "email_transport": args.email_transport,
+            "requests_per_level": args.requests,
+        },
+        "results": {},
+    }
+
+    scenarios = build_scenarios(inquiry_ids)
+    selected = args.scenarios or list(scenarios)
+    if not args.mongo_url:
+        skipped = [name for name in selected if name in MONGO_ONLY_SCENARIOS]
+        if skipped:
+            print(f"Skipping {', '.join(skipped)}: needs --mongo-url")
+        selected = [name for name in selected if name not in MONGO_ONLY_SCENARIOS]
+    transport = httpx.ASGITransport(app=server.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            for name in selected:
+                if name == "create_inquiry":
+                    outbox_started, outbox_sent_before = time.perf_counter(), smtp.messages
+                results["results"][name] = {}
+                for concurrency in args.concurrency:
+                    summary = await run_load(client, scenarios[name], args.requests, concurrency)
+                    results["results"][name][str(concurrency)] = summary
+                    print(
+                        f"{name:16} c={concurrency:<4} {summary['requests_per_second']:>10} req/s  "
+                        f"p50 {summary['p50_ms']:>8} ms  p95 {summary['p95_ms']:>8} ms  "
+                        f"p99 {summary['p99_ms']:>8} ms  errors {summary['errors']}"
+                    )
+
+        if "create_inquiry" in selected:
+            results["outbox_drain"] = await measure_outbox_drain(server, smtp, outbox_started, outbox_sent_before)
+            print(f"Outbox drain: {results['outbox_drain']}")
+        results["stats_reconcile"] = await benchmark_stats_reconcile(server)
+        print(f"Stats reconcile: {results['stats_reconcile']}")
+        results["templates"] = benchmark_templates(server)
+        print(f"Templates: {results['templates']}")
+        results["list_serialization"] = await benchmark_list_serialization(server)
+        print(f"List serialization: {results['list_serialization']}")
+    finally:
+        for task in server.background_tasks:
+            task.cancel()
+        # QUIT waits for the fake server's reply, so it must not block the event loop
+        await asyncio.get_running_loop().run_in_executor(None, server.smtp_pool.close_all)
+        if server.async_smtp_pool is not None:
+            await server.async_smtp_pool.close_all()
+        if args.mongo_url:
+            await server.client.drop_database(server.db.name)
+        await smtp.stop()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and concurrency level")
+    parser.add_argument("--seed", type=int, default=1000, help="inquiries to insert before measuring")
+    parser.add_argument("--scenarios", nargs="+", help="subset of scenarios to run")
+    parser.add_argument("--smtp-latency", type=float, default=0.2, help="seconds the fake SMTP server takes per message")
+    parser.add_argument("--email-transport", choices=["asyncio", "executor"], default="asyncio")
+    parser.add_argument("--status-cache-ttl", type=float, default=5.0)
+    parser.add_argument("--mongo-url", help="benchmark against a real MongoDB instead of mongomock")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="fail if results regress against this results file")
+    parser.add_argument("--save-baseline", help="also write the results to this baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression as a fraction")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmarks(args))
+
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"\nResults saved to {args.output}")
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(results, indent=2))
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        if regressions:
+            print("\n❌ Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return False
+        print("\n✅ No regressions against baseline")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
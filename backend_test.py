@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 import requests
 import json
+import os
 import time
 import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Base URL from frontend/.env
@@ -168,6 +171,30 @@ def test_contact_inquiry_validation():
                 "inspection_type": "invalid-type"
             },
             "expected_status": 422
+        },
+        {
+            "name": "Free Text Preferred Date",
+            "data": {
+                "name": "Test User",
+                "email": "test@example.com",
+                "phone": "0412345678",
+                "property_address": "123 Test St",
+                "inspection_type": "pre-purchase",
+                "preferred_date": "next Tuesday"
+            },
+            "expected_status": 422
+        },
+        {
+            "name": "Impossible Preferred Date",
+            "data": {
+                "name": "Test User",
+                "email": "test@example.com",
+                "phone": "0412345678",
+                "property_address": "123 Test St",
+                "inspection_type": "pre-purchase",
+                "preferred_date": "2024-02-30"
+            },
+            "expected_status": 422
         }
     ]
     
@@ -278,8 +305,277 @@ def test_contact_statistics():
     
     return False
 
+def test_stats_consistency():
+    """Test 6: Stats Counters Stay Consistent Under Concurrent Updates"""
+    statuses = ["new", "contacted", "scheduled", "completed", "cancelled"]
+    
+    def get_stats():
+        response = requests.get(f"{BASE_URL}/contact/stats")
+        response.raise_for_status()
+        return response.json()
+    
+    def patch_status(args):
+        inquiry_id, status = args
+        return requests.patch(f"{BASE_URL}/contact/inquiry/{inquiry_id}/status", params={"status": status}).status_code
+    
+    try:
+        before = get_stats()
+        
+        inquiry_ids = []
+        for index in range(5):
+            response = requests.post(f"{BASE_URL}/contact/inquiry", json={
+                "name": f"Counter Check {index}",
+                "email": "counter.check@example.com",
+                "phone": "0412345678",
+                "property_address": "1 Test Street, Melbourne VIC 3000",
+                "inspection_type": "pre-purchase"
+            })
+            response.raise_for_status()
+            inquiry_ids.append(response.json()["id"])
+        
+        # Race 50 status changes across the new inquiries
+        updates = [(inquiry_ids[index % len(inquiry_ids)], statuses[index % len(statuses)]) for index in range(50)]
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            codes = list(executor.map(patch_status, updates))
+        
+        final_statuses = [
+            requests.get(f"{BASE_URL}/contact/inquiry/{inquiry_id}").json()["status"] for inquiry_id in inquiry_ids
+        ]
+        after = get_stats()
+        
+        expected = dict(before["status_breakdown"])
+        for status in final_statuses:
+            expected[status] = expected.get(status, 0) + 1
+        problems = []
+        if any(code != 200 for code in codes):
+            problems.append(f"{sum(code != 200 for code in codes)} status updates failed")
+        if after["total_inquiries"] != before["total_inquiries"] + len(inquiry_ids):
+            problems.append(f"total moved by {after['total_inquiries'] - before['total_inquiries']}, expected {len(inquiry_ids)}")
+        if after["status_breakdown"] != expected:
+            problems.append(f"status breakdown {after['status_breakdown']}, expected {expected}")
+        if sum(after["status_breakdown"].values()) != after["total_inquiries"]:
+            problems.append("status breakdown does not add up to the total")
+        
+        if not problems:
+            log_test("Stats Consistency", True, 
+                     f"Counters match the final state after {len(updates)} concurrent status updates")
+            return True
+        log_test("Stats Consistency", False, 
+                 "Counters drifted under concurrent updates (other traffic during the test also shows here)",
+                 problems)
+    except Exception as e:
+        log_test("Stats Consistency", False, f"Exception occurred: {str(e)}")
+    
+    return False
+
+def test_bulk_status_updates():
+    """Test 7: Bulk Status Update Results and Counters"""
+    statuses = ["new", "contacted", "scheduled", "completed", "cancelled"]
+    
+    def bulk_update(updates):
+        response = requests.patch(f"{BASE_URL}/contact/inquiries/status", json=updates)
+        response.raise_for_status()
+        return response.json()
+    
+    def patch_status(args):
+        inquiry_id, status = args
+        return requests.patch(f"{BASE_URL}/contact/inquiry/{inquiry_id}/status", params={"status": status}).status_code
+    
+    try:
+        before = requests.get(f"{BASE_URL}/contact/stats").json()
+        
+        inquiry_ids = []
+        for index in range(4):
+            response = requests.post(f"{BASE_URL}/contact/inquiry", json={
+                "name": f"Bulk Status Check {index}",
+                "email": "bulk.status@example.com",
+                "phone": "0412345678",
+                "property_address": "1 Test Street, Melbourne VIC 3000",
+                "inspection_type": "new-home"
+            })
+            response.raise_for_status()
+            inquiry_ids.append(response.json()["id"])
+        first, second, duplicated, raced = inquiry_ids
+        
+        problems = []
+        data = bulk_update([
+            {"id": first, "status": "contacted"},
+            {"id": second, "status": "scheduled"},
+            {"id": "00000000-0000-0000-0000-000000000000", "status": "contacted"},
+            {"id": duplicated, "status": "completed"},
+            {"id": duplicated, "status": "cancelled"},
+        ])
+        outcomes = [(result["status"], result.get("previous_status")) for result in data["results"]]
+        expected_outcomes = [("success", "new"), ("success", "new"), ("not_found", None), ("error", None), ("error", None)]
+        if outcomes != expected_outcomes:
+            problems.append(f"results {outcomes}, expected {expected_outcomes}")
+        if (data["updated"], data["failed"]) != (2, 3):
+            problems.append(f"updated/failed {data['updated']}/{data['failed']}, expected 2/3")
+        
+        # Race single updates against bulk ones on the same inquiry: each bulk result must be
+        # success or conflict, and the counters must still match the final statuses
+        conflicts = 0
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for index in range(20):
+                bulk = executor.submit(bulk_update, [{"id": raced, "status": statuses[index % len(statuses)]}])
+                executor.map(patch_status, [(raced, statuses[(index + 2) % len(statuses)])] * 2)
+                result = bulk.result()["results"][0]["status"]
+                if result not in ("success", "conflict"):
+                    problems.append(f"raced bulk update returned {result}")
+                conflicts += result == "conflict"
+        
+        final_statuses = [
+            requests.get(f"{BASE_URL}/contact/inquiry/{inquiry_id}").json()["status"] for inquiry_id in inquiry_ids
+        ]
+        after = requests.get(f"{BASE_URL}/contact/stats").json()
+        expected = dict(before["status_breakdown"])
+        for status in final_statuses:
+            expected[status] = expected.get(status, 0) + 1
+        if after["status_breakdown"] != expected:
+            problems.append(f"status breakdown {after['status_breakdown']}, expected {expected}")
+        
+        if not problems:
+            log_test("Bulk Status Updates", True, 
+                     f"Success, not_found and duplicate results as expected; counters consistent after 20 raced "
+                     f"bulk updates ({conflicts} reported as conflicts)")
+            return True
+        log_test("Bulk Status Updates", False, 
+                 "Unexpected bulk status results (other traffic during the test also shows here)",
+                 problems)
+    except Exception as e:
+        log_test("Bulk Status Updates", False, f"Exception occurred: {str(e)}")
+    
+    return False
+
+def test_idempotency_key():
+    """Test 8: Concurrent Retries with one Idempotency-Key Create one Inquiry"""
+    idempotency_key = f"backend-test-{uuid.uuid4()}"
+    payload = {
+        "name": "Idempotency Check",
+        "email": "idempotency.check@example.com",
+        "phone": "0412345678",
+        "property_address": "1 Test Street, Melbourne VIC 3000",
+        "inspection_type": "pre-purchase"
+    }
+    
+    def post(body):
+        return requests.post(f"{BASE_URL}/contact/inquiry", json=body, headers={"Idempotency-Key": idempotency_key})
+    
+    try:
+        before = requests.get(f"{BASE_URL}/contact/stats").json()
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            responses = list(executor.map(post, [payload] * 5))
+        after = requests.get(f"{BASE_URL}/contact/stats").json()
+        mismatch = post({**payload, "name": "Different Body"})
+        
+        problems = []
+        codes = [response.status_code for response in responses]
+        if any(code != 200 for code in codes):
+            problems.append(f"status codes {codes}")
+        ids = {response.json().get("id") for response in responses if response.status_code == 200}
+        if len(ids) != 1:
+            problems.append(f"{len(ids)} distinct inquiry ids returned")
+        if after["total_inquiries"] != before["total_inquiries"] + 1:
+            problems.append(f"total moved by {after['total_inquiries'] - before['total_inquiries']}, expected 1")
+        if mismatch.status_code != 422:
+            problems.append(f"reusing the key with a different body returned {mismatch.status_code}, expected 422")
+        
+        if not problems:
+            log_test("Idempotency Key", True, 
+                     "5 concurrent requests with one key created a single inquiry; a different body was rejected")
+            return True
+        log_test("Idempotency Key", False, 
+                 "Duplicate requests were not collapsed (other traffic during the test also shows here)",
+                 problems)
+    except Exception as e:
+        log_test("Idempotency Key", False, f"Exception occurred: {str(e)}")
+    
+    return False
+
+def test_list_filters():
+    """Test 9: Inquiry List Filters and Field Projection"""
+    all_passed = True
+    
+    filters = {
+        "status": "new",
+        "inspection_type": "pre-purchase",
+        "created_from": "2024-01-01T00:00:00",
+        "preferred_from": "2024-01-01",
+        "preferred_to": "2030-12-31",
+    }
+    try:
+        response = requests.get(f"{BASE_URL}/contact/inquiries", params={**filters, "fields": "name,status,inspection_type"})
+        
+        if response.status_code == 200:
+            data = response.json()
+            mismatched = [
+                item for item in data
+                if item.get("status") != "new" or item.get("inspection_type") != "pre-purchase"
+                or "message" in item or "email" in item
+            ]
+            if not mismatched:
+                log_test("Filtered Inquiry List", True, 
+                         f"Retrieved {len(data)} inquiries matching every filter with only the requested fields")
+            else:
+                log_test("Filtered Inquiry List", False, 
+                         "Some inquiries don't match the filters or carry unrequested fields",
+                         mismatched[:3])
+                all_passed = False
+        else:
+            log_test("Filtered Inquiry List", False, 
+                     f"Failed to filter inquiries. Status code: {response.status_code}",
+                     response.json() if response.text else None)
+            all_passed = False
+    except Exception as e:
+        log_test("Filtered Inquiry List", False, f"Exception occurred: {str(e)}")
+        all_passed = False
+    
+    try:
+        response = requests.get(f"{BASE_URL}/contact/inquiries", params={"fields": "name,password"})
+        
+        if response.status_code == 400:
+            log_test("Unknown Projection Field", True, "Unknown fields are rejected with 400")
+        else:
+            log_test("Unknown Projection Field", False, 
+                     f"Expected 400, got {response.status_code}")
+            all_passed = False
+    except Exception as e:
+        log_test("Unknown Projection Field", False, f"Exception occurred: {str(e)}")
+        all_passed = False
+    
+    return all_passed
+
+def test_query_plans():
+    """Test 10: Every list filter combination is served by an index"""
+    admin_token = os.environ.get("ADMIN_API_TOKEN")
+    if not admin_token:
+        print("⚠️ SKIPPED - Query Plans (set ADMIN_API_TOKEN to run)")
+        return True
+    
+    try:
+        response = requests.get(f"{BASE_URL}/admin/query-plans", headers={"X-Admin-Token": admin_token})
+        
+        if response.status_code == 200:
+            data = response.json()
+            if not data["collection_scans"]:
+                log_test("Query Plans", True, 
+                         f"All {data['checked']} hot-path queries use an index")
+                return True
+            else:
+                log_test("Query Plans", False, 
+                         f"{len(data['collection_scans'])} of {data['checked']} queries use a collection scan",
+                         data["collection_scans"])
+        else:
+            log_test("Query Plans", False, 
+                     f"Failed to explain queries. Status code: {response.status_code}",
+                     response.json() if response.text else None)
+    except Exception as e:
+        log_test("Query Plans", False, f"Exception occurred: {str(e)}")
+    
+    return False
+
 def test_data_persistence():
-    """Test 6: Data Persistence with multiple inquiries"""
+    """Test 11: Data Persistence with multiple inquiries"""
     # Create multiple inquiries with different inspection types
     inquiry_ids = []
     
@@ -379,7 +675,7 @@ def test_data_persistence():
         return False
 
 def test_email_functionality():
-    """Test 7: Email Functionality with Gmail App Password"""
+    """Test 12: Email Functionality with Gmail App Password"""
     try:
         # Test data specifically for email testing
         email_test_data = {
@@ -440,7 +736,7 @@ def test_email_functionality():
     return None
 
 def test_email_branding():
-    """Test 8: Verify Email Templates Contain New Branding"""
+    """Test 13: Verify Email Templates Contain New Branding"""
     try:
         # Read the server.py file to check email template content
         with open('/app/backend/server.py', 'r') as f:
@@ -506,13 +802,28 @@ def run_all_tests():
     # Test 5: Contact Statistics
     test_contact_statistics()
     
-    # Test 6: Data Persistence
+    # Test 6: Stats Counter Consistency
+    test_stats_consistency()
+    
+    # Test 7: Bulk Status Updates
+    test_bulk_status_updates()
+    
+    # Test 8: Idempotency Key
+    test_idempotency_key()
+    
+    # Test 9: List Filters and Field Projection
+    test_list_filters()
+    
+    # Test 10: Query Plans
+    test_query_plans()
+    
+    # Test 11: Data Persistence
     test_data_persistence()
     
-    # Test 7: Email Functionality
+    # Test 12: Email Functionality
     test_email_functionality()
     
-    # Test 8: Email Branding Verification
+    # Test 13: Email Branding Verification
     test_email_branding()
     
     # Print summary
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
 import { Button } from './ui/button';
 import { Badge } from './ui/badge';
@@ -6,6 +6,8 @@ import { Eye, Phone, Mail, MapPin, Calendar, BarChart3, Users, FileText, Filter
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
+// The list only shows these; the details panel loads the full inquiry
+const LIST_FIELDS = 'name,status,phone,email,property_address,inspection_type';
 
 const AdminDashboard = () => {
   const [inquiries, setInquiries] = useState([]);
@@ -13,23 +15,81 @@ const AdminDashboard = () => {
   const [loading, setLoading] = useState(true);
   const [selectedInquiry, setSelectedInquiry] = useState(null);
   const [statusFilter, setStatusFilter] = useState('all');
+  const [typeFilter, setTypeFilter] = useState('all');
+  const [checkedIds, setCheckedIds] = useState([]);
+  // "id:status" of our own updates, so their inquiry.status events are not applied twice
+  const ownChanges = useRef(new Set());
 
   useEffect(() => {
-    fetchInquiries();
-    fetchStats();
-  }, [statusFilter]);
+    fetchDashboard();
+    setCheckedIds([]);
+  }, [statusFilter, typeFilter]);
 
-  const fetchInquiries = async () => {
+  const matchesFilter = (inquiry) => (statusFilter === 'all' || inquiry.status === statusFilter)
+    && (typeFilter === 'all' || inquiry.inspection_type === typeFilter);
+  const adjust = (breakdown, key, delta) => ({ ...breakdown, [key]: (breakdown?.[key] || 0) + delta });
+
+  const applyStatusChange = (change) => {
+    setInquiries((current) => current
+      .map((item) => item.id === change.id
+        ? { ...item, status: change.status, ...(change.updated_at && { updated_at: change.updated_at }) }
+        : item)
+      .filter(matchesFilter));
+    setSelectedInquiry((current) => current && current.id === change.id
+      ? { ...current, status: change.status }
+      : current);
+    if (change.previous_status) {
+      setStats((current) => current && {
+        ...current,
+        status_breakdown: adjust(adjust(current.status_breakdown, change.previous_status, -1), change.status, 1)
+      });
+    } else {
+      fetchStats();
+    }
+  };
+
+  // Apply inquiry changes pushed by the server instead of re-fetching
+  useEffect(() => {
+    const events = new EventSource(`${API}/contact/events`);
+
+    events.addEventListener('inquiry.created', (event) => {
+      const inquiry = JSON.parse(event.data);
+      setInquiries((current) => matchesFilter(inquiry)
+        ? [inquiry, ...current.filter((item) => item.id !== inquiry.id)]
+        : current);
+      setStats((current) => current && {
+        ...current,
+        total_inquiries: current.total_inquiries + 1,
+        status_breakdown: adjust(current.status_breakdown, inquiry.status, 1),
+        inspection_type_breakdown: adjust(current.inspection_type_breakdown, inquiry.inspection_type, 1),
+        recent_inquiries_7_days: current.recent_inquiries_7_days + 1
+      });
+    });
+
+    events.addEventListener('inquiry.status', (event) => {
+      const change = JSON.parse(event.data);
+      // Our own updates are applied from the PATCH response, whichever arrives first
+      if (ownChanges.current.delete(`${change.id}:${change.status}`)) return;
+      applyStatusChange(change);
+    });
+
+    return () => events.close();
+  }, [statusFilter, typeFilter]);
+
+  const fetchDashboard = async () => {
     try {
-      const url = statusFilter === 'all' 
-        ? `${API}/contact/inquiries`
-        : `${API}/contact/inquiries?status=${statusFilter}`;
+      const params = new URLSearchParams({ fields: LIST_FIELDS });
+      if (statusFilter !== 'all') params.set('status', statusFilter);
+      if (typeFilter !== 'all') params.set('inspection_type', typeFilter);
       
-      const response = await fetch(url);
+      const response = await fetch(`${API}/contact/dashboard?${params}`);
       const data = await response.json();
-      setInquiries(data);
+      setInquiries(data.inquiries);
+      setStats(data.stats);
+      setLoading(false);
     } catch (error) {
-      console.error('Error fetching inquiries:', error);
+      console.error('Error fetching dashboard:', error);
+      setLoading(false);
     }
   };
 
@@ -45,25 +105,75 @@ const AdminDashboard = () => {
     }
   };
 
+  const selectInquiry = async (inquiry) => {
+    setSelectedInquiry(inquiry);
+    try {
+      const response = await fetch(`${API}/contact/inquiry/${inquiry.id}`);
+      if (response.ok) {
+        const data = await response.json();
+        setSelectedInquiry((current) => current && current.id === data.id ? data : current);
+      }
+    } catch (error) {
+      console.error('Error fetching inquiry:', error);
+    }
+  };
+
   const updateInquiryStatus = async (inquiryId, newStatus) => {
+    const key = `${inquiryId}:${newStatus}`;
+    ownChanges.current.add(key);
+    try {
+      const response = await fetch(`${API}/contact/inquiry/${inquiryId}/status?status=${newStatus}`, {
+        method: 'PATCH'
+      });
+      
+      if (response.ok) {
+        const data = await response.json();
+        applyStatusChange({ id: inquiryId, previous_status: data.previous_status, status: newStatus });
+      } else {
+        ownChanges.current.delete(key);
+      }
+    } catch (error) {
+      ownChanges.current.delete(key);
+      console.error('Error updating status:', error);
+    }
+  };
+
+  const updateCheckedStatuses = async (newStatus) => {
+    const keys = checkedIds.map((id) => `${id}:${newStatus}`);
+    keys.forEach((key) => ownChanges.current.add(key));
     try {
-      const response = await fetch(`${API}/contact/inquiry/${inquiryId}/status`, {
+      const response = await fetch(`${API}/contact/inquiries/status`, {
         method: 'PATCH',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ status: newStatus })
+        body: JSON.stringify(checkedIds.map((id) => ({ id, status: newStatus })))
       });
       
       if (response.ok) {
-        fetchInquiries();
-        if (selectedInquiry && selectedInquiry.id === inquiryId) {
-          setSelectedInquiry({ ...selectedInquiry, status: newStatus });
-        }
+        const data = await response.json();
+        data.results.forEach((result) => {
+          if (result.status === 'success') {
+            applyStatusChange({ id: result.id, previous_status: result.previous_status, status: newStatus });
+          } else {
+            ownChanges.current.delete(`${result.id}:${newStatus}`);
+          }
+        });
+        // Keep failed ones checked
+        setCheckedIds(data.results.filter((result) => result.status !== 'success').map((result) => result.id));
+      } else {
+        keys.forEach((key) => ownChanges.current.delete(key));
       }
     } catch (error) {
-      console.error('Error updating status:', error);
+      keys.forEach((key) => ownChanges.current.delete(key));
+      console.error('Error updating statuses:', error);
     }
   };
 
+  const toggleChecked = (inquiryId) => {
+    setCheckedIds((current) => current.includes(inquiryId)
+      ? current.filter((id) => id !== inquiryId)
+      : [...current, inquiryId]);
+  };
+
   const getStatusColor = (status) => {
     const colors = {
       'new': 'bg-red-100 text-red-800',
@@ -181,7 +291,30 @@ const AdminDashboard = () => {
                     <span>Contact Inquiries</span>
                   </CardTitle>
                   <div className="flex items-center space-x-2">
+                    {checkedIds.length > 0 && (
+                      <select
+                        value=""
+                        onChange={(e) => e.target.value && updateCheckedStatuses(e.target.value)}
+                        className="border border-gray-300 rounded px-3 py-1 text-sm"
+                      >
+                        <option value="">Mark {checkedIds.length} selected as...</option>
+                        <option value="new">New</option>
+                        <option value="contacted">Contacted</option>
+                        <option value="scheduled">Scheduled</option>
+                        <option value="completed">Completed</option>
+                        <option value="cancelled">Cancelled</option>
+                      </select>
+                    )}
                     <Filter className="w-4 h-4 text-gray-500" />
+                    <select
+                      value={typeFilter}
+                      onChange={(e) => setTypeFilter(e.target.value)}
+                      className="border border-gray-300 rounded px-3 py-1 text-sm"
+                    >
+                      <option value="all">All Types</option>
+                      <option value="pre-purchase">Pre-Purchase</option>
+                      <option value="new-home">New Home</option>
+                    </select>
                     <select
                       value={statusFilter}
                       onChange={(e) => setStatusFilter(e.target.value)}
@@ -203,10 +336,18 @@ const AdminDashboard = () => {
                     <div
                       key={inquiry.id}
                       className="border border-gray-200 rounded-lg p-4 hover:bg-gray-50 cursor-pointer transition-colors"
-                      onClick={() => setSelectedInquiry(inquiry)}
+                      onClick={() => selectInquiry(inquiry)}
                     >
                       <div className="flex items-center justify-between mb-2">
-                        <h3 className="font-semibold text-gray-900">{inquiry.name}</h3>
+                        <div className="flex items-center space-x-2">
+                          <input
+                            type="checkbox"
+                            checked={checkedIds.includes(inquiry.id)}
+                            onChange={() => toggleChecked(inquiry.id)}
+                            onClick={(e) => e.stopPropagation()}
+                          />
+                          <h3 className="font-semibold text-gray-900">{inquiry.name}</h3>
+                        </div>
                         <Badge className={getStatusColor(inquiry.status)}>
                           {inquiry.status}
                         </Badge>